@@ -0,0 +1,263 @@
+import os
+import numpy as np
+
+# Internal Numba kernels for PixelAdjacencyGraph. Importing this module requires Numba, which is an optional dependency.
+# PixelAdjacencyGraph falls back to its pure Python implementation if the import fails, or if the kernels are disabled
+# by setting the environment variable RASTER_TO_VECTOR_DISABLE_NUMBA to 1.
+if os.environ.get('RASTER_TO_VECTOR_DISABLE_NUMBA', '0') != '0':
+    raise ImportError('Numba kernels are disabled by RASTER_TO_VECTOR_DISABLE_NUMBA')
+
+from numba import njit
+
+# Row and column increments to reach the neighbouring node for each edge index from 0 to 7.
+_ROW_INC = np.array([-1, -1, -1,  0,  0,  1,  1,  1], dtype=np.int8)
+_COL_INC = np.array([-1,  0,  1, -1,  1, -1,  0,  1], dtype=np.int8)
+
+@njit(cache=True)
+def chain_length_nb(adjacency_matrix, node_degrees, start_row_0, start_col_0, start_row_1, start_col_1):
+    """
+    Get the length of the chain of nodes with degree at most 2 that contains either of the 2 starting nodes.
+
+    Args:
+        adjacency_matrix (NDArray[uint8]): Adjacency bitmask of shape (height, width), where bit `i` denotes edge `i`.
+        node_degrees (NDArray[int8]): Degree of each node, of shape (height, width).
+        start_row_0 (int): Row index of the first starting node.
+        start_col_0 (int): Column index of the first starting node.
+        start_row_1 (int): Row index of the second starting node.
+        start_col_1 (int): Column index of the second starting node.
+
+    Returns:
+        int: Number of nodes of degree at most 2 reachable from the starting nodes through such nodes.
+    """
+    height, width = adjacency_matrix.shape
+    visited = np.zeros((height, width), dtype=np.bool_)
+
+    # Every node is pushed at most once, so the stack never holds more than height*width nodes.
+    stack_rows = np.empty(height * width, dtype=np.int32)
+    stack_cols = np.empty(height * width, dtype=np.int32)
+    stack_rows[0], stack_cols[0] = start_row_0, start_col_0
+    stack_rows[1], stack_cols[1] = start_row_1, start_col_1
+    visited[start_row_0, start_col_0] = True
+    visited[start_row_1, start_col_1] = True
+    stack_top = 2
+
+    chain_length = 0
+    while stack_top > 0:
+        stack_top -= 1
+        row, col = stack_rows[stack_top], stack_cols[stack_top]
+        if node_degrees[row, col] > 2:
+            continue
+        chain_length += 1
+        for edge_index in range(8):
+            if not (adjacency_matrix[row, col] >> edge_index) & 1:
+                continue
+            next_row = row + _ROW_INC[edge_index]
+            next_col = col + _COL_INC[edge_index]
+            if visited[next_row, next_col]:
+                continue
+            visited[next_row, next_col] = True
+            stack_rows[stack_top], stack_cols[stack_top] = next_row, next_col
+            stack_top += 1
+    return chain_length
+
+@njit(cache=True)
+def num_connected_components_nb(adjacency_matrix):
+    """
+    Count the connected components of the adjacency graph using a union-find over the flattened node indices.
+
+    Args:
+        adjacency_matrix (NDArray[uint8]): Adjacency bitmask of shape (height, width), where bit `i` denotes edge `i`.
+
+    Returns:
+        int: Number of connected components in the graph.
+    """
+    height, width = adjacency_matrix.shape
+    parent = np.arange(height * width, dtype=np.int32)
+
+    num_components = height * width
+    for row in range(height):
+        for col in range(width):
+            # Every undirected edge is also stored at its other end point, so only the edges 4 to 7 need to be visited.
+            for edge_index in range(4, 8):
+                if not (adjacency_matrix[row, col] >> edge_index) & 1:
+                    continue
+                node = _find_root(parent, row * width + col)
+                next_node = _find_root(parent, (row + _ROW_INC[edge_index]) * width + col + _COL_INC[edge_index])
+                if node != next_node:
+                    parent[max(node, next_node)] = min(node, next_node)
+                    num_components -= 1
+    return num_components
+
+@njit(cache=True)
+def _find_root(parent, node):
+    """
+    Find the root of a node in a union-find forest, halving the path along the way.
+
+    Args:
+        parent (NDArray[int32]): Parent of each node in the union-find forest. Updated in place.
+        node (int): Flattened index of the node.
+
+    Returns:
+        int: Flattened index of the root node.
+    """
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+@njit(cache=True)
+def prune_conflicting_edges_nb(adjacency_matrix, node_degrees, pixel_colour_ids, threshold_ratio=4):
+    """
+    Resolve the crossing diagonals of all 2x2 blocks whose 4 nodes are non-planar, in raster order.
+
+    Mirrors `PixelAdjacencyGraph._prune_conflicting_edges()`: each conflict is resolved by preserving the longer chain, then the
+    more prominent colour in the surrounding 6x6 window, then the edge whose removal would split the graph into more components.
+
+    Args:
+        adjacency_matrix (NDArray[uint8]): Adjacency bitmask of shape (height, width). Updated in place.
+        node_degrees (NDArray[int8]): Degree of each node, of shape (height, width). Updated in place.
+        pixel_colour_ids (NDArray[uint]): Palette index of the colour of each pixel, of shape (height, width).
+        threshold_ratio (int): Minimum ratio between the pixel counts of the 2 colours for the more prominent one to be preserved.
+    """
+    height, width = adjacency_matrix.shape
+    is_node_planar = np.ones((height, width), dtype=np.bool_)
+    for row in range(height-1):
+        for col in range(width-1):
+            if _is_block_crossing(adjacency_matrix, row, col):
+                is_node_planar[row:row+2, col:col+2] = False
+
+    # Removing edges can only make nodes planar, so a block that is not in conflict now never will be.
+    for row in range(height-1):
+        for col in range(width-1):
+            if is_node_planar[row, col] or is_node_planar[row, col+1] or is_node_planar[row+1, col] or is_node_planar[row+1, col+1]:
+                continue
+
+            # Edge 7 of the top-left node is the dexter diagonal, edge 2 of the bottom-left node is the sinister diagonal.
+            remove_dexter = False
+            remove_sinister = False
+
+            dexter_chain_length = chain_length_nb(adjacency_matrix, node_degrees, row, col, row+1, col+1)
+            sinister_chain_length = chain_length_nb(adjacency_matrix, node_degrees, row+1, col, row, col+1)
+            if dexter_chain_length > sinister_chain_length:
+                remove_sinister = True
+            elif dexter_chain_length < sinister_chain_length:
+                remove_dexter = True
+
+            if not (remove_dexter or remove_sinister):
+                window_top, window_left = max(row-2, 0), max(col-2, 0)
+                window_bottom, window_right = min(window_top + 6, height), min(window_left + 6, width)
+                pixel_count_dexter = 0
+                pixel_count_sinister = 0
+                for window_row in range(window_top, window_bottom):
+                    for window_col in range(window_left, window_right):
+                        if pixel_colour_ids[window_row, window_col] == pixel_colour_ids[row, col]:
+                            pixel_count_dexter += 1
+                        if pixel_colour_ids[window_row, window_col] == pixel_colour_ids[row, col+1]:
+                            pixel_count_sinister += 1
+                if pixel_count_dexter > 0 and pixel_count_sinister >= threshold_ratio * pixel_count_dexter:
+                    remove_sinister = True
+                elif pixel_count_sinister > 0 and pixel_count_dexter >= threshold_ratio * pixel_count_sinister:
+                    remove_dexter = True
+
+            if not (remove_dexter or remove_sinister):
+                dexter_was_set = _clear_edge(adjacency_matrix, row, col, 7)
+                connected_components_without_dexter = num_connected_components_nb(adjacency_matrix)
+                if dexter_was_set:
+                    _restore_edge(adjacency_matrix, row, col, 7)
+                sinister_was_set = _clear_edge(adjacency_matrix, row+1, col, 2)
+                connected_components_without_sinister = num_connected_components_nb(adjacency_matrix)
+                if sinister_was_set:
+                    _restore_edge(adjacency_matrix, row+1, col, 2)
+                if connected_components_without_dexter > connected_components_without_sinister:
+                    remove_sinister = True
+                elif connected_components_without_dexter < connected_components_without_sinister:
+                    remove_dexter = True
+
+            if remove_dexter and _clear_edge(adjacency_matrix, row, col, 7):
+                node_degrees[row, col] -= 1
+                node_degrees[row+1, col+1] -= 1
+            if remove_sinister and _clear_edge(adjacency_matrix, row+1, col, 2):
+                node_degrees[row+1, col] -= 1
+                node_degrees[row, col+1] -= 1
+
+            for node_row in range(row, row+2):
+                for node_col in range(col, col+2):
+                    is_node_planar[node_row, node_col] = _is_node_planar(adjacency_matrix, node_row, node_col)
+
+@njit(cache=True)
+def _is_block_crossing(adjacency_matrix, row, col):
+    """
+    Check whether both diagonals of the 2x2 block with top-left node (row, col) are present.
+    """
+    return (adjacency_matrix[row, col] >> 7) & (adjacency_matrix[row, col+1] >> 5) & 1 == 1
+
+@njit(cache=True)
+def _is_node_planar(adjacency_matrix, row, col):
+    """
+    Check whether none of the (up to 4) 2x2 blocks containing the node (row, col) have crossing diagonals.
+    """
+    height, width = adjacency_matrix.shape
+    for block_row in range(max(row-1, 0), min(row, height-2) + 1):
+        for block_col in range(max(col-1, 0), min(col, width-2) + 1):
+            if _is_block_crossing(adjacency_matrix, block_row, block_col):
+                return False
+    return True
+
+@njit(cache=True)
+def _clear_edge(adjacency_matrix, row, col, edge_index):
+    """
+    Clear an edge at both of its end points. Returns whether the edge was present.
+    """
+    if not (adjacency_matrix[row, col] >> edge_index) & 1:
+        return False
+    adjacency_matrix[row, col] &= 0xFF ^ (1 << edge_index)
+    adjacency_matrix[row + _ROW_INC[edge_index], col + _COL_INC[edge_index]] &= 0xFF ^ (1 << (7 - edge_index))
+    return True
+
+@njit(cache=True)
+def _restore_edge(adjacency_matrix, row, col, edge_index):
+    """
+    Set an edge at both of its end points.
+    """
+    adjacency_matrix[row, col] |= 1 << edge_index
+    adjacency_matrix[row + _ROW_INC[edge_index], col + _COL_INC[edge_index]] |= 1 << (7 - edge_index)
+
+@njit(cache=True)
+def label_connected_components_nb(adjacency_matrix, connected_component_ids):
+    """
+    Label the connected components of the adjacency graph in raster order of their first node.
+
+    Mirrors `PixelAdjacencyGraph._set_connected_component_ids()`: nodes that already have a non-negative ID are left untouched.
+
+    Args:
+        adjacency_matrix (NDArray[uint8]): Adjacency bitmask of shape (height, width), where bit `i` denotes edge `i`.
+        connected_component_ids (NDArray[int64]): Connected component ID of each node, of shape (height, width). Updated in place.
+    """
+    height, width = adjacency_matrix.shape
+    stack_rows = np.empty(height * width, dtype=np.int32)
+    stack_cols = np.empty(height * width, dtype=np.int32)
+
+    num_connected_components = 0
+    for start_row in range(height):
+        for start_col in range(width):
+            if connected_component_ids[start_row, start_col] >= 0:
+                continue
+
+            component_id = num_connected_components
+            num_connected_components += 1
+            connected_component_ids[start_row, start_col] = component_id
+            stack_rows[0], stack_cols[0] = start_row, start_col
+            stack_top = 1
+            while stack_top > 0:
+                stack_top -= 1
+                row, col = stack_rows[stack_top], stack_cols[stack_top]
+                for edge_index in range(8):
+                    if not (adjacency_matrix[row, col] >> edge_index) & 1:
+                        continue
+                    next_row = row + _ROW_INC[edge_index]
+                    next_col = col + _COL_INC[edge_index]
+                    if connected_component_ids[next_row, next_col] >= 0:
+                        continue
+                    connected_component_ids[next_row, next_col] = component_id
+                    stack_rows[stack_top], stack_cols[stack_top] = next_row, next_col
+                    stack_top += 1
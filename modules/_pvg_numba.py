@@ -0,0 +1,111 @@
+import os
+import numpy as np
+
+# Internal Numba kernels for PixelVectorGraph. Importing this module requires Numba, which is an optional dependency.
+# PixelVectorGraph falls back to its pure Python implementation if the import fails, or if the kernels are disabled
+# by setting the environment variable RASTER_TO_VECTOR_DISABLE_NUMBA to 1.
+if os.environ.get('RASTER_TO_VECTOR_DISABLE_NUMBA', '0') != '0':
+    raise ImportError('Numba kernels are disabled by RASTER_TO_VECTOR_DISABLE_NUMBA')
+
+from numba import njit
+
+# Edges created in each grid box, for the 3 cases: dexter diagonal present, sinister diagonal present, neither diagonal present.
+# Each row is (start node index, end node index, row offset of the pixel, column offset of the pixel, index of the opposite edge),
+# where node indices are as in PixelVectorGraph.graph_nodes_grid_box and the opposite edge is indexed within the same grid box.
+# Rows past the number of edges of a case are padding and never read.
+_GRID_BOX_EDGES = np.array([
+    [[5, 2, 0, 0, 4], [2, 4, 0, 0, 8], [4, 8, 0, 0, 5], [6, 2, 0, 1, 9], [2, 5, 0, 1, 0],
+     [8, 4, 1, 0, 2], [4, 7, 1, 0, 7], [7, 4, 1, 1, 6], [4, 2, 1, 1, 1], [2, 6, 1, 1, 3]],
+    [[5, 1, 0, 0, 4], [1, 8, 0, 0, 5], [6, 3, 0, 1, 9], [3, 1, 0, 1, 6], [1, 5, 0, 1, 0],
+     [8, 1, 1, 0, 1], [1, 3, 1, 0, 3], [3, 7, 1, 0, 8], [7, 3, 1, 1, 7], [3, 6, 1, 1, 2]],
+    [[5, 0, 0, 0, 3], [0, 8, 0, 0, 4], [6, 0, 0, 1, 7], [0, 5, 0, 1, 0], [8, 0, 1, 0, 1],
+     [0, 7, 1, 0, 6], [7, 0, 1, 1, 5], [0, 6, 1, 1, 2], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0]],
+], dtype=np.int32)
+
+# Number of edges created in a grid box for each of the 3 cases.
+_NUM_GRID_BOX_EDGES = np.array([10, 10, 8], dtype=np.int32)
+
+@njit(cache=True)
+def wire_edges_nb(grid_box_cases, graph_node_ids):
+    """
+    Compute the edges of the pixel vector graph in the order `PixelVectorGraph._initialize_graph_edges()` creates them.
+
+    Grid boxes are visited in raster order, and each of them gets the edges of its case.
+
+    Args:
+        grid_box_cases (NDArray[int8]): Case of each grid box, of shape (height-1, width-1), as returned by
+            `PixelVectorGraph._get_grid_box_cases()`.
+        graph_node_ids (NDArray[int32]): ID of each node in the grid boxes, of shape (height-1, width-1, 9).
+
+    Returns:
+        tuple[NDArray[int32], ...]: Arrays of length E holding, for each edge, the ID of its start node, the ID of its end node,
+        the row and column of its pixel, and the index of its opposite edge.
+    """
+    num_rows, num_cols = graph_node_ids.shape[0], graph_node_ids.shape[1]
+
+    # Every grid box has at most 10 edges, so the arrays are allocated for the upper bound and trimmed at the end.
+    max_edges = 10 * num_rows * num_cols
+    start_node_ids = np.empty(max_edges, dtype=np.int32)
+    end_node_ids = np.empty(max_edges, dtype=np.int32)
+    pixel_rows = np.empty(max_edges, dtype=np.int32)
+    pixel_cols = np.empty(max_edges, dtype=np.int32)
+    opposite_edge_ids = np.empty(max_edges, dtype=np.int32)
+
+    num_edges = 0
+    for row in range(num_rows):
+        for col in range(num_cols):
+            case = grid_box_cases[row, col]
+            for local_index in range(_NUM_GRID_BOX_EDGES[case]):
+                edge = num_edges + local_index
+                start_node_ids[edge] = graph_node_ids[row, col, _GRID_BOX_EDGES[case, local_index, 0]]
+                end_node_ids[edge] = graph_node_ids[row, col, _GRID_BOX_EDGES[case, local_index, 1]]
+                pixel_rows[edge] = row + _GRID_BOX_EDGES[case, local_index, 2]
+                pixel_cols[edge] = col + _GRID_BOX_EDGES[case, local_index, 3]
+                opposite_edge_ids[edge] = num_edges + _GRID_BOX_EDGES[case, local_index, 4]
+            num_edges += _NUM_GRID_BOX_EDGES[case]
+
+    return (start_node_ids[:num_edges], end_node_ids[:num_edges], pixel_rows[:num_edges],
+            pixel_cols[:num_edges], opposite_edge_ids[:num_edges])
+
+@njit(cache=True)
+def trace_edge_walks_nb(next_edge_ids):
+    """
+    Follow the next edges from each edge that has not been visited yet, in order of edge ID, until the walk returns to its first edge,
+    reaches an edge without a next edge, or reaches an edge visited by an earlier walk.
+
+    Mirrors `PixelVectorGraph._trace_edge_walks()`.
+
+    Args:
+        next_edge_ids (NDArray[intp]): ID of the next edge of each edge, or -1 if the edge has no next edge.
+
+    Returns:
+        tuple[NDArray[int32], NDArray[int32], NDArray[bool]]: IDs of the edges in the order they are visited, the offset of the first
+        edge of each walk in it followed by the total number of edges, and whether each walk returned to its first edge.
+    """
+    num_edges = next_edge_ids.shape[0]
+    visited = np.zeros(num_edges, dtype=np.bool_)
+    walk_edge_ids = np.empty(num_edges, dtype=np.int32)
+    walk_offsets = np.empty(num_edges + 1, dtype=np.int32)
+    is_walk_closed = np.empty(num_edges, dtype=np.bool_)
+
+    num_visited_edges = 0
+    num_walks = 0
+    for start_edge in range(num_edges):
+        if visited[start_edge]:
+            continue
+        walk_offsets[num_walks] = num_visited_edges
+        is_walk_closed[num_walks] = False
+
+        edge = start_edge
+        while edge >= 0 and not visited[edge]:
+            visited[edge] = True
+            walk_edge_ids[num_visited_edges] = edge
+            num_visited_edges += 1
+            edge = next_edge_ids[edge]
+            if edge == start_edge:
+                is_walk_closed[num_walks] = True
+                break
+        num_walks += 1
+
+    walk_offsets[num_walks] = num_visited_edges
+    return walk_edge_ids, walk_offsets[:num_walks+1], is_walk_closed[:num_walks]
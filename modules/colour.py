@@ -4,17 +4,20 @@ from numpy.typing import NDArray
 # TODO (P1): Use Google-style Class Docstring to comment all classes
 
 class Colour:
-    def __init__(self, colour_list: list = [0,0,0,0]):
+    __slots__ = ('r', 'g', 'b', 'a', '_colour_as_array')
+
+    def __init__(self, colour_list: list = None):
         """
         Initialise a COlour object.
 
         Args:
             colour_list (list): An iterable object containing 4 values denoting RGBA values respectively (0 to 255).
+                Defaults to transparent black (0,0,0,0).
         """
-        self.r: int = colour_list[0]
-        self.g: int = colour_list[1]
-        self.b: int = colour_list[2]
-        self.a: int = colour_list[3]
+        if colour_list is None:
+            colour_list = (0, 0, 0, 0)
+        self.r, self.g, self.b, self.a = colour_list
+        self._colour_as_array: NDArray[np.uint8] = None
 
     def __str__(self) -> str:
         """
@@ -24,6 +27,14 @@ class Colour:
             str: String of the form '(r,g,b,a)'.
         """
         return f'({self.r}, {self.g}, {self.b}, {self.a})'
+
+    def __setattr__(self, name: str, value):
+        """
+        Set an attribute. Changing any of the r, g, b, a values discards the cached array, so that __array__() builds it again.
+        """
+        object.__setattr__(self, name, value)
+        if name != '_colour_as_array':
+            object.__setattr__(self, '_colour_as_array', None)
     
     def __eq__(self, other) -> bool:
         """
@@ -34,12 +45,15 @@ class Colour:
         """
         return self.r == other.r and self.g == other.g and self.b == other.b and self.a == other.a
 
-    def __array__(self) -> NDArray[np.uint64]:
+    def __array__(self) -> NDArray[np.uint8]:
         """
-        Returns a Numpy array of the format [r,g,b,a].
+        Returns a Numpy array of the format [r,g,b,a]. The array is built on the first call and reused until one of the r, g, b, a
+        values changes, so it is read-only.
 
         Returns:
-            NDArray[np.uint64]: Numpy array of the format [r,g,b,a].
+            NDArray[np.uint8]: Numpy array of the format [r,g,b,a].
         """
-        colour_as_array: NDArray[np.uint64] = np.array([self.r, self.g, self.b, self.a], dtype = np.uint64)
-        return colour_as_array
\ No newline at end of file
+        if self._colour_as_array is None:
+            self._colour_as_array = np.array([self.r, self.g, self.b, self.a], dtype = np.uint8)
+            self._colour_as_array.flags.writeable = False
+        return self._colour_as_array
\ No newline at end of file
@@ -1,10 +1,33 @@
 import numpy as np
+from contextlib import contextmanager
 from IPython.display import HTML
 from numpy.typing import NDArray
 
 from svg_renderer import SVGRenderer
-from vector_2d import Vector2D
-from pixel_art_raster import _Pixel, PixelArtRaster
+from pixel_art_raster import PixelArtRaster
+
+try:
+    from _pag_numba import chain_length_nb, label_connected_components_nb, num_connected_components_nb, prune_conflicting_edges_nb
+except ImportError:
+    # Numba is optional. Without it, the pure Python implementations below are used.
+    chain_length_nb = label_connected_components_nb = num_connected_components_nb = prune_conflicting_edges_nb = None
+
+# Row and column increments to reach the neighbouring node for each edge index from 0 to 7.
+# Plain tuples are used so that the resulting indices remain Python ints.
+_ROW_INC: tuple[int, ...] = (-1, -1, -1,  0,  0,  1,  1,  1)
+_COL_INC: tuple[int, ...] = (-1,  0,  1, -1,  1, -1,  0,  1)
+
+# Index of the same edge as seen from the neighbouring node, for each edge index from 0 to 7.
+_OPPOSITE_EDGE: tuple[int, ...] = (7, 6, 5, 4, 3, 2, 1, 0)
+
+# Edge indices present in each possible uint8 value of the adjacency bitmask. Edges leading out of the image are never set,
+# so iterating over these is enough to visit all neighbours of a node.
+_SET_BITS_LUT: tuple[tuple[int, ...], ...] = tuple(
+    tuple(edge_index for edge_index in range(8) if (value >> edge_index) & 1) for value in range(256)
+)
+
+# Number of set bits in each possible uint8 value. Used to count the edges of a node in the adjacency bitmask.
+_BIT_COUNT_LUT: NDArray[np.int8] = np.array([bin(value).count('1') for value in range(256)], dtype=np.int8)
 
 # TODO (P1): Use Google-style Class Docstring to comment private methods
 # TODO (P3): Write tests for this module
@@ -16,12 +39,18 @@ class PixelAdjacencyGraph:
 
     Attributes:
         pixel_art_raster (PixelArtRaster): Thw pixel art raster object for which the graph needs to be constructed.
-        adjacency_graph (NDArray[bool]): Array of shape (height, width, 8) that denotes the adjacency matrix if the graph.
+        adjacency_matrix (NDArray[uint8]): Bitmask of shape (height, width) that denotes the adjacency matrix of the graph.
 
-            Each pixel is connected to upto 8 other pixels, either horizontally, vertically, or diagonally. Indices from 0 to 7 
+            Each pixel is connected to upto 8 other pixels, either horizontally, vertically, or diagonally. Bits from 0 to 7 
             represent the adjacent pixels at the top-left, top, top-right, left, right, bottom-left, bottom, bottom-right of the pixel respectively.
 
-            Eg: `adjacency_graph[30, 40, 2]` denotes whether pixel with index `[30, 40]` is connected to the pixel at its top-right, i.e., `[29, 41]`.
+            Eg: `(adjacency_matrix[30, 40] >> 2) & 1` denotes whether pixel with index `[30, 40]` is connected to the pixel at its top-right, i.e., `[29, 41]`.
+            Use `get_adjacency_matrix()` for the equivalent boolean array of shape (height, width, 8).
+
+        node_degrees (NDArray[int8]): Array of shape (height, width) containing the number of edges incident to each pixel.
+
+        pixel_colour_ids (NDArray[uint]): Array of shape (height, width) containing the index of each pixel's colour in the image palette.
+            Pixels have the same colour if and only if they have the same colour id.
 
         svg_renderer (SVGRenderer): SVG Renderer object to store and render SVG elements. Used for visualisation and testing the graph.
     """
@@ -46,17 +75,54 @@ class PixelAdjacencyGraph:
 # PUBLIC    
     def get_adjacency_matrix(self, deep_copy: bool = True) -> NDArray[bool]:
         """
-        Returns a copy of the adjacency matrix.
+        Returns a copy of the adjacency matrix, unpacked from the bitmask into a boolean array.
 
         Args:
-            deep_copy (bool): If True, creates a copy of the adjacency matrix and returns it.
-                If False, returns a reference to the object's adjacency matrix (Not recommended).
+            deep_copy (bool): Must be True, as the unpacked matrix is always a new array and changes to it are not reflected in the graph.
+                To modify the graph in place, use `set_edge()`, or `get_adjacency_bitmask(deep_copy=False)` to access the stored bitmask.
+
+        Returns:
+            NDArray[bool]: Array of shape (height, width, 8), where `[row, col, edge_index]` denotes whether the edge is present.
+
+        Raises:
+            ValueError: If deep_copy is False.
+        """
+        if not deep_copy:
+            raise ValueError('The adjacency matrix is stored as a bitmask and cannot be returned by reference. '
+                             'Use set_edge() or get_adjacency_bitmask(deep_copy=False) to modify the graph in place.')
+        unpacked_matrix = np.unpackbits(self.adjacency_matrix[..., np.newaxis], axis=-1, bitorder='little')
+        return unpacked_matrix.astype(bool)
+
+    def get_adjacency_bitmask(self, deep_copy: bool = True) -> NDArray[np.uint8]:
+        """
+        Returns a copy of the adjacency bitmask, where bit `edge_index` of `[row, col]` denotes whether the edge is present.
+
+        Args:
+            deep_copy (bool): If True, creates a copy of the adjacency bitmask and returns it.
+                If False, returns a reference to the object's adjacency bitmask (Not recommended).
         """
         if deep_copy:
             return np.array(self.adjacency_matrix)
         return self.adjacency_matrix
 
-    def set_edge(self, row: int, col: int, edge_index: int, value: bool = True, matrix: NDArray[bool] = None):
+    def get_edge(self, row: int, col: int, edge_index: int, matrix: NDArray[np.uint8] = None) -> bool:
+        """
+        Returns whether an edge is present.
+
+        Args:
+            row (int): Row index of the pixel, from 0 to height-1 (inclusive).
+            col (int): Column index of the pixel, from 0 to width-1 (inclusive).
+            edge_index (int): Index from 0 to 7 (inclusive) denoting the particular edge incident to the specified pixel.
+            matrix (NDArray[uint8]): Specifies the adjacency bitmask to read. By default reads the `adjacency_matrix` of this object.
+
+        Returns:
+            bool: True if the edge is present, False otherwise.
+        """
+        if matrix is None:
+            matrix = self.adjacency_matrix
+        return bool((matrix[row, col] >> edge_index) & 1)
+
+    def set_edge(self, row: int, col: int, edge_index: int, value: bool = True, matrix: NDArray[np.uint8] = None):
         """
         Sets or resets the connectivity of an edge.
 
@@ -68,15 +134,23 @@ class PixelAdjacencyGraph:
             col (int): Column index of the poxel, from 0 to width-1 (inclusive).
             edge_index (int): Index from 0 to 7 (inclusive) denoting the particular edge incident to the specified pixel.
             value (bool): Value of the edge to be set. Defaults to True.
-            matrix (NDArray[bool]): Specifies the adjacency matrix to modify. By default modifies the `adjacency_graph` array of this object.
+            matrix (NDArray[uint8]): Specifies the adjacency bitmask to modify. By default modifies the `adjacency_matrix` of this object.
         """
         if matrix is None:
             matrix = self.adjacency_matrix
 
-        opposite_row, opposite_col = self.get_neighbouring_node(row, col, edge_index)
-        matrix[row, col, edge_index] \
-            = matrix[opposite_row, opposite_col, 7-edge_index] \
-            = value
+        opposite_row, opposite_col = row + _ROW_INC[edge_index], col + _COL_INC[edge_index]
+        edge_bit = 1 << edge_index
+        opposite_edge_bit = 1 << _OPPOSITE_EDGE[edge_index]
+        if matrix is self.adjacency_matrix and bool(matrix[row, col] & edge_bit) != value:
+            self._update_node_degrees(row, col, opposite_row, opposite_col, 1 if value else -1)
+
+        if value:
+            matrix[row, col] |= edge_bit
+            matrix[opposite_row, opposite_col] |= opposite_edge_bit
+        else:
+            matrix[row, col] &= 0xFF ^ edge_bit
+            matrix[opposite_row, opposite_col] &= 0xFF ^ opposite_edge_bit
 
     def get_non_planar_nodes(self) -> NDArray[bool]:
         """
@@ -86,19 +160,7 @@ class PixelAdjacencyGraph:
             NDArray[bool]: Array of shape (height, width) corresponding to the adjacency graph nodes. A node is marked True
             if and only if any of its incident edges is nonplaner.
         """
-        is_node_planar = np.ones(self.adjacency_matrix.shape[:2], dtype=bool)
-
-        for row in range(self.adjacency_matrix.shape[0]-1):
-            for col in range(self.adjacency_matrix.shape[1]-1):
-                if not(self.adjacency_matrix[row, col, 7] and self.adjacency_matrix[row, col+1, 5]):
-                    continue
-                is_node_planar[row, col] \
-                    = is_node_planar[row, col+1] \
-                    = is_node_planar[row+1, col] \
-                    = is_node_planar[row+1, col+1] \
-                    = False
-        
-        return is_node_planar
+        return self._get_node_planarity(self.adjacency_matrix)
     
     # Given a node edge index, return the neighbouring node
     def get_neighbouring_node(self, row: int, col: int, edge_index: int) -> tuple[int, int]:
@@ -124,13 +186,7 @@ class PixelAdjacencyGraph:
         Returns:
             int, int: row and column indices of the neighbouring node.
         """
-        row_inc = [-1, -1, -1,  0,  0,  1,  1,  1]
-        col_inc = [-1,  0,  1, -1,  1, -1,  0,  1]
-
-        next_row = row + row_inc[edge_index]
-        next_col = col + col_inc[edge_index]
-
-        return next_row, next_col
+        return row + _ROW_INC[edge_index], col + _COL_INC[edge_index]
     
     def get_connected_component_ids(self) -> NDArray[int]:
         """
@@ -139,12 +195,7 @@ class PixelAdjacencyGraph:
         Returns:
             NDArray[int]: Array of shape (height, width) where each element indicates the connected component ID of the corresponding function.
         """
-        connected_component_ids: NDArray[int] = np.full(self.pixel_art_raster.pixel_grid.shape[:2], -1, dtype=int)
-
-        for row, col in np.ndindex(self.pixel_art_raster.pixel_grid.shape[:2]):
-            pixel: _Pixel = self.pixel_art_raster.pixel_grid[row, col]
-            connected_component_ids[row, col] = pixel.connected_component_id
-        
+        connected_component_ids: NDArray[int] = np.copy(self.pixel_art_raster.pixel_connected_component_ids)
         return connected_component_ids
     
     def render(self, render_pixel_art: bool = True, svg_scale_factor: int = None) -> object:
@@ -172,69 +223,94 @@ class PixelAdjacencyGraph:
 # PRIVATE
     def  _init_adjacency_graph(self):
         """
-        Initialise `adjacency_graph` to a boolean array of the same shape as the image.
+        Initialise `adjacency_matrix` to a uint8 bitmask of the same shape as the image, and `pixel_colour_ids` from the image palette.
 
-        All edges that connect to other pixels are set to True. Edges that do not connect to any pixels are set to False.
+        All edges that connect to other pixels are set. Edges that do not connect to any pixels are cleared.
         """
-        pixel_art_image = self.pixel_art_raster.get_pixel_art_image()
-        self.adjacency_matrix = np.ones((pixel_art_image.shape[0], pixel_art_image.shape[1], 8), dtype=bool)
+        # Read the raster's uint8 colours in place, viewing each RGBA pixel as a single uint32 so that np.unique works on scalars.
+        pixel_colours = np.ascontiguousarray(self.pixel_art_raster.pixel_colours)
+        packed_colours = pixel_colours.view(np.uint32).reshape(pixel_colours.shape[:2])
+        palette, pixel_colour_ids = np.unique(packed_colours, return_inverse=True)
+        self.pixel_colour_ids = pixel_colour_ids.reshape(packed_colours.shape).astype(np.min_scalar_type(len(palette)-1))
 
-        # Initially, mark all edges as true, except the ones at the borders of the image.
-        for row in range(pixel_art_image.shape[0]):
-            self.adjacency_matrix[row, 0, 0] = self.adjacency_matrix[row, 0, 3] = self.adjacency_matrix[row, 0, 5] = False
-            self.adjacency_matrix[row, -1, 2] = self.adjacency_matrix[row, -1, 4] = self.adjacency_matrix[row, -1, 7] = False
+        # Summed-area tables of pixel_colour_ids, one per colour id, built on demand by the colour prominence resolver.
+        self._colour_count_tables: dict[int, NDArray[np.int32]] = {}
+
+        self.adjacency_matrix = np.full(packed_colours.shape, 0xFF, dtype=np.uint8)
 
-        for col in range(pixel_art_image.shape[1]):
-            self.adjacency_matrix[0, col, 0] = self.adjacency_matrix[0, col, 1] = self.adjacency_matrix[0, col, 2] = False
-            self.adjacency_matrix[-1, col, 5] = self.adjacency_matrix[-1, col, 6] = self.adjacency_matrix[-1, col, 7] = False
+        # Initially, mark all edges as true, except the ones at the borders of the image.
+        self.adjacency_matrix[:, 0] &= 0xFF ^ 0b00101001     # Edges 0, 3, 5
+        self.adjacency_matrix[:, -1] &= 0xFF ^ 0b10010100    # Edges 2, 4, 7
+        self.adjacency_matrix[0, :] &= 0xFF ^ 0b00000111     # Edges 0, 1, 2
+        self.adjacency_matrix[-1, :] &= 0xFF ^ 0b11100000    # Edges 5, 6, 7
+        self.node_degrees = self._get_node_degrees()
     
     # Make the adjacency graphplanar by pruning overlapping edges
     def _make_graph_planar(self):
         # Prune non-planar edges
-        self._prune_edges_from_dissimilar_colours()
-        self._prune_edges_from_complete_subgraphs()
+        self._prune_local_edges()
         self._prune_conflicting_edges()
 
     '''Pruning Methods'''
 
-    # Any nodes that do not have similar colours should not have an edge between them
-    def _prune_edges_from_dissimilar_colours(self):
-        pixel_art_image = self.pixel_art_raster.get_pixel_art_image()
-        for row, col in np.ndindex(self.adjacency_matrix.shape[:2]):
-            for i in self._get_edge_indices(row, col):
-                next_row, next_col = self.get_neighbouring_node(row, col, i)
-                # TODO (P4): We may want to support colours that are similar but not exactly the same later.
-                if(self.adjacency_matrix[row, col, i] and (pixel_art_image[row, col] != pixel_art_image[next_row, next_col]).any()):
-                    self.set_edge(row, col, i, False)
-    
+    # Any nodes that do not have similar colours should not have an edge between them.
+    # Any complete 2x2 subgraphs do not need the X edges between them.
+    # Both rules only look at 2x2 neighbourhoods, so they are applied together in a single pass over the image.
+    def _prune_local_edges(self):
+        pixel_colour_ids = self.pixel_colour_ids
+
+        # Compare the whole image against itself shifted towards the right, bottom, bottom-right and bottom-left neighbours.
+        # TODO (P4): We may want to support colours that are similar but not exactly the same later.
+        is_similar_right = pixel_colour_ids[:, :-1] == pixel_colour_ids[:, 1:]
+        is_similar_bottom = pixel_colour_ids[:-1, :] == pixel_colour_ids[1:, :]
+        is_similar_bottom_right = pixel_colour_ids[:-1, :-1] == pixel_colour_ids[1:, 1:]
+        is_similar_bottom_left = pixel_colour_ids[:-1, 1:] == pixel_colour_ids[1:, :-1]
+
+        # A 2x2 subgraph is complete if the top-left node keeps its right, bottom and bottom-right edges,
+        # the top-right node keeps its bottom edge and the bottom-left node keeps its right edge.
+        is_complete_subgraph = (is_similar_right[:-1, :] & is_similar_bottom[:, :-1] & is_similar_bottom_right
+                                & is_similar_bottom[:, 1:] & is_similar_right[1:, :])
+
+        # Each entry is (edge_index, mask of edges to keep, slices of the source pixels, slices of the neighbouring pixels).
+        # The remaining edges are mirrors of these, i.e., edge 7-edge_index of the neighbouring pixel.
+        shifted_slices = [
+            (4, is_similar_right, (slice(None), slice(None, -1)), (slice(None), slice(1, None))),
+            (6, is_similar_bottom, (slice(None, -1), slice(None)), (slice(1, None), slice(None))),
+            (7, is_similar_bottom_right & ~is_complete_subgraph, (slice(None, -1), slice(None, -1)), (slice(1, None), slice(1, None))),
+            (5, is_similar_bottom_left & ~is_complete_subgraph, (slice(None, -1), slice(1, None)), (slice(1, None), slice(None, -1))),
+        ]
+        for edge_index, is_kept, source, neighbour in shifted_slices:
+            # Only the removed edges are written to, through boolean masks on views of the source and neighbouring pixels.
+            is_removed = ~is_kept
+            self.adjacency_matrix[source][is_removed] &= 0xFF ^ (1 << edge_index)
+            self.adjacency_matrix[neighbour][is_removed] &= 0xFF ^ (1 << (7-edge_index))
+        self.node_degrees = self._get_node_degrees()
+
+        # Removing the diagonals of complete subgraphs does not disconnect any nodes, so the components are those of similar colours.
         self._set_connected_component_ids()
-
-    # Any complete 2x2 subgraphs do not need the X edges between them
-    def _prune_edges_from_complete_subgraphs(self):
-        for row in range(self.adjacency_matrix.shape[0]-1):
-            for col in range(self.adjacency_matrix.shape[1]-1):
-                if(
-                    self.adjacency_matrix[row, col, 4] and self.adjacency_matrix[row, col, 6] and self.adjacency_matrix[row, col, 7] and
-                    self.adjacency_matrix[row, col+1, 3] and self.adjacency_matrix[row, col+1, 6] and self.adjacency_matrix[row+1, col, 4]
-                ):
-                    self.set_edge(row, col, 7, False)
-                    self.set_edge(row+1, col, 2, False)
     
     # Some 2x2 subgrids have a 'checkerboard' pattern where the overlapping edges conflict.
     # Resolve such edges
     def _prune_conflicting_edges(self):
+        if prune_conflicting_edges_nb is not None:
+            prune_conflicting_edges_nb(self.adjacency_matrix, self.node_degrees, self.pixel_colour_ids)
+            return
+
         is_node_planar = self.get_non_planar_nodes()
-        for row in range(self.adjacency_matrix.shape[0]-1):
-            for col in range(self.adjacency_matrix.shape[1]-1):
-                if not (is_node_planar[row,col] or is_node_planar[row,col+1] or is_node_planar[row+1,col] or is_node_planar[row+1,col+1]):
-                    chain_resolved = self._resolve_edge_conflict_by_preserving_chains(row, col)
-                    if not chain_resolved:
-                        chain_resolved = self._resolve_edge_conflict_by_preserving_more_prominent_edge_colour(row, col)
-                    if not chain_resolved:
-                        chain_resolved = self._resolve_edge_conflict_by_preserving_connected_components(row, col)
-                    # TODO (P0): There might be edges that are still unresolved. Resolve those.
-                    # TODO (P3): Optimise the line below to recompute only the affected edges, instead of the whole graph
-                    is_node_planar = self.get_non_planar_nodes()
+
+        # Removing edges can only make nodes planar, so only the blocks that are non-planar at the start can ever need resolving.
+        # They are still resolved one at a time in raster order, since each resolution affects the ones that follow.
+        is_block_non_planar = ~(is_node_planar[:-1,:-1] | is_node_planar[:-1,1:] | is_node_planar[1:,:-1] | is_node_planar[1:,1:])
+        for row, col in np.argwhere(is_block_non_planar).tolist():
+            if is_node_planar[row,col] or is_node_planar[row,col+1] or is_node_planar[row+1,col] or is_node_planar[row+1,col+1]:
+                continue
+            chain_resolved = self._resolve_edge_conflict_by_preserving_chains(row, col)
+            if not chain_resolved:
+                chain_resolved = self._resolve_edge_conflict_by_preserving_more_prominent_edge_colour(row, col)
+            if not chain_resolved:
+                chain_resolved = self._resolve_edge_conflict_by_preserving_connected_components(row, col)
+            # TODO (P0): There might be edges that are still unresolved. Resolve those.
+            self._update_node_planarity(is_node_planar, row, col)
 
     '''Specialised Methods for Edge Conflict Resolution'''
 
@@ -258,17 +334,14 @@ class PixelAdjacencyGraph:
     # Removes the edge with the sparser colour.
     # Returns True if the conflict is resolved, False otherwise.
     def _resolve_edge_conflict_by_preserving_more_prominent_edge_colour(self, row, col, threshold_ratio = 4):
-        pixel_art_image = self.pixel_art_raster.get_pixel_art_image()
         window_top_left = [max(row-2, 0), max(col-2, 0)]
         window_bottom_right = [min(window_top_left[0] + 6, self.adjacency_matrix.shape[0]), min(window_top_left[1] + 6, self.adjacency_matrix.shape[1])]
 
-        pixel_art_window = pixel_art_image[window_top_left[0]:window_bottom_right[0], window_top_left[1]:window_bottom_right[1]]
-
-        colour_dexter = pixel_art_image[row, col]
-        colour_sinister = pixel_art_image[row, col+1]
+        colour_dexter = self.pixel_colour_ids[row, col]
+        colour_sinister = self.pixel_colour_ids[row, col+1]
 
-        pixel_count_dexter = self._count_pixels_with_certain_colour(pixel_art_window, colour_dexter)
-        pixel_count_sinister = self._count_pixels_with_certain_colour(pixel_art_window, colour_sinister)
+        pixel_count_dexter = self._count_pixels_with_certain_colour(window_top_left, window_bottom_right, colour_dexter)
+        pixel_count_sinister = self._count_pixels_with_certain_colour(window_top_left, window_bottom_right, colour_sinister)
 
         if pixel_count_dexter > 0 and pixel_count_sinister/pixel_count_dexter >= threshold_ratio:
             self.set_edge(row+1, col, 2, False)
@@ -282,15 +355,10 @@ class PixelAdjacencyGraph:
     # Whichever edge's removal would cause the graph to break into more number of connected components is preserved.
     # Returns True if the conflict is resolved, False otherwise.
     def _resolve_edge_conflict_by_preserving_connected_components(self, row, col):
-        adjacency_matrix_without_dexter = np.copy(self.adjacency_matrix)
-        self.set_edge(row, col, 7, False, matrix = adjacency_matrix_without_dexter)
-        adjacency_matrix_without_sinister = np.copy(self.adjacency_matrix)
-        self.set_edge(row+1, col, 2, False, matrix = adjacency_matrix_without_sinister)
-
-        connected_components_without_dexter = \
-            self.num_connected_components(adjacency_matrix_without_dexter)
-        connected_components_without_sinister = \
-            self.num_connected_components(adjacency_matrix_without_sinister)
+        with self._temporary_edge(row, col, 7, False):
+            connected_components_without_dexter = self.num_connected_components()
+        with self._temporary_edge(row+1, col, 2, False):
+            connected_components_without_sinister = self.num_connected_components()
 
         if connected_components_without_dexter > connected_components_without_sinister:
             self.set_edge(row+1, col, 2, False)
@@ -301,70 +369,124 @@ class PixelAdjacencyGraph:
         return False
 
     '''Other Helper Methods'''
-    
-    # For a given node, return the list of valid edge indices
-    def _get_edge_indices(self, row, col):
-        edge_indices = []
-        if row > 0:
-            if col > 0:
-                edge_indices.append(0)
-            edge_indices.append(1)
-            if col < self.adjacency_matrix.shape[1]-1:
-                edge_indices.append(2)
-        if col > 0:
-            edge_indices.append(3)
-        if col < self.adjacency_matrix.shape[1]-1:
-            edge_indices.append(4)
-        if row < self.adjacency_matrix.shape[0]-1:
-            if col > 0:
-                edge_indices.append(5)
-            edge_indices.append(6)
-            if col < self.adjacency_matrix.shape[1]-1:
-                edge_indices.append(7)
-        return edge_indices
+
+    # Temporarily sets an edge in the adjacency graph, restoring its previous value on exit.
+    # Lets the conflict resolvers try out an edit in place instead of copying the whole matrix.
+    @contextmanager
+    def _temporary_edge(self, row, col, edge_index, value):
+        previous_value = self.get_edge(row, col, edge_index)
+        self.set_edge(row, col, edge_index, value)
+        try:
+            yield
+        finally:
+            self.set_edge(row, col, edge_index, previous_value)
     
     # Get a matrix of the degrees of all nodes in the graph
     def _get_node_degrees(self):
-        node_degrees = np.zeros(self.adjacency_matrix.shape[:2], dtype=int)
-        for row, col in np.ndindex(self.adjacency_matrix.shape[:2]):
-            node_degrees[row, col] = np.count_nonzero(self.adjacency_matrix[row, col])
-        return node_degrees
+        return _BIT_COUNT_LUT[self.adjacency_matrix]
+
+    def _update_node_degrees(self, row: int, col: int, opposite_row: int, opposite_col: int, delta: int):
+        """
+        Update the cached `node_degrees` of both end points of an edge that has been added or removed.
+
+        Args:
+            row (int): Row index of one end point of the edge.
+            col (int): Column index of one end point of the edge.
+            opposite_row (int): Row index of the other end point of the edge.
+            opposite_col (int): Column index of the other end point of the edge.
+            delta (int): 1 if the edge has been added, -1 if it has been removed.
+        """
+        self.node_degrees[row, col] += delta
+        self.node_degrees[opposite_row, opposite_col] += delta
+
+    @staticmethod
+    def _get_node_planarity(matrix: NDArray[np.uint8]) -> NDArray[bool]:
+        """
+        Mark the nodes of the given adjacency matrix that are not incident to any crossing diagonals.
+
+        Args:
+            matrix (NDArray[uint8]): Adjacency bitmask of shape (height, width).
+
+        Returns:
+            NDArray[bool]: Array of shape (height, width). A node is marked False if and only if it belongs to a
+            2x2 block whose diagonals cross each other.
+        """
+        is_node_planar = np.ones(matrix.shape, dtype=bool)
+
+        # A 2x2 block is non-planar if both of its diagonals are present. All 4 nodes of such a block are marked.
+        has_crossing_diagonals = ((matrix[:-1, :-1] >> 7) & (matrix[:-1, 1:] >> 5) & 1).astype(bool)
+        is_node_planar[:-1, :-1] &= ~has_crossing_diagonals
+        is_node_planar[:-1, 1:] &= ~has_crossing_diagonals
+        is_node_planar[1:, :-1] &= ~has_crossing_diagonals
+        is_node_planar[1:, 1:] &= ~has_crossing_diagonals
+
+        return is_node_planar
+
+    def _update_node_planarity(self, is_node_planar: NDArray[bool], row: int, col: int):
+        """
+        Recompute the planarity of the 4 nodes of the 2x2 block at (row, col) after its diagonals have been modified.
+        Only the 3x3 window of 2x2 blocks around it can affect these nodes, so the rest of the graph is not scanned.
+
+        Args:
+            is_node_planar (NDArray[bool]): Array returned by `get_non_planar_nodes()`. Updated in place.
+            row (int): Row index of the top-left node of the modified 2x2 block.
+            col (int): Column index of the top-left node of the modified 2x2 block.
+        """
+        top, left = max(row-1, 0), max(col-1, 0)
+        bottom = min(row+2, self.adjacency_matrix.shape[0]-1)
+        right = min(col+2, self.adjacency_matrix.shape[1]-1)
+
+        window_planarity = self._get_node_planarity(self.adjacency_matrix[top:bottom+1, left:right+1])
+        is_node_planar[row:row+2, col:col+2] = window_planarity[row-top:row-top+2, col-left:col-left+2]
 
     # For a given pair of nodes thatmaybeina chain, get the length of the chain
     def _get_chain_length(self, starting_nodes_list):
+        if chain_length_nb is not None:
+            (start_row_0, start_col_0), (start_row_1, start_col_1) = starting_nodes_list
+            return chain_length_nb(self.adjacency_matrix, self.node_degrees,
+                                   start_row_0, start_col_0, start_row_1, start_col_1)
+
         visited = np.zeros(self.adjacency_matrix.shape[:2], dtype = bool)
         nodes_to_visit = starting_nodes_list
         for row, col in nodes_to_visit:
             visited[row, col] = True
         chain_length = 0
 
-        node_degrees = self._get_node_degrees()
         while len(nodes_to_visit) > 0:
             row, col = nodes_to_visit.pop()
-            if node_degrees[row, col] <= 2:
+            if self.node_degrees[row, col] <= 2:
                 chain_length += 1
-                for i in range(8):
+                for i in _SET_BITS_LUT[self.adjacency_matrix[row, col]]:
                     next_node = self.get_neighbouring_node(row, col, i)
-                    if self.adjacency_matrix[row, col, i] and not visited[next_node]:
+                    if not visited[next_node]:
                         visited[next_node] = True
                         nodes_to_visit.append(next_node)
         return chain_length
 
-    def _count_pixels_with_certain_colour(self, pixel_art_window, colour):
-        count = 0
-        for row, col in np.ndindex(pixel_art_window.shape[:2]):
-            if (pixel_art_window[row, col] == colour).all():
-                count += 1
-        return count
+    # Count the pixels of a colour within the window [top_left, bottom_right) using its summed-area table.
+    # The table of each colour is built the first time that colour is queried.
+    def _count_pixels_with_certain_colour(self, window_top_left, window_bottom_right, colour_id):
+        colour_count_table = self._colour_count_tables.get(colour_id)
+        if colour_count_table is None:
+            colour_count_table = np.zeros((self.pixel_colour_ids.shape[0]+1, self.pixel_colour_ids.shape[1]+1), dtype = np.int32)
+            np.cumsum(np.cumsum(self.pixel_colour_ids == colour_id, axis=0, dtype = np.int32), axis=1, out = colour_count_table[1:, 1:])
+            self._colour_count_tables[colour_id] = colour_count_table
+
+        (top, left), (bottom, right) = window_top_left, window_bottom_right
+        return int(colour_count_table[bottom, right] - colour_count_table[top, right]
+                   - colour_count_table[bottom, left] + colour_count_table[top, left])
 
     # TODO (P1): Rename to _num_connected_components
     def num_connected_components(self, matrix = None):
         if matrix is None:
             matrix = self.adjacency_matrix
+        if num_connected_components_nb is not None:
+            return num_connected_components_nb(matrix)
 
         count = 0
-        visited = np.zeros(matrix.shape[:2], dtype=bool)
-        for row, col in np.ndindex(matrix.shape[:2]):
+        visited = np.zeros(matrix.shape, dtype=bool)
+        for node in range(matrix.size):
+            row, col = divmod(node, matrix.shape[1])
             if visited[row, col]:
                 continue
             count += 1
@@ -372,9 +494,9 @@ class PixelAdjacencyGraph:
             visited[row, col] = True
             while len(to_visit) > 0:
                 x, y = to_visit.pop()
-                for i in self._get_edge_indices(x, y):
+                for i in _SET_BITS_LUT[matrix[x, y]]:
                     next_node = self.get_neighbouring_node(x, y, i)
-                    if matrix[x, y, i] and not visited[next_node]:
+                    if not visited[next_node]:
                         visited[next_node] = True
                         to_visit.append(next_node)
         return count
@@ -388,62 +510,55 @@ class PixelAdjacencyGraph:
                                           edge_colour_failure = (255, 0, 0, 1.0),
                                           edge_width = 2):
         adjacency_matrix = self.get_adjacency_matrix()
+        height, width = adjacency_matrix.shape[:2]
         # Add graph nodes
-        if mark_erroneous_nodes:
-            is_node_planar = self.get_non_planar_nodes()
-
-        for row, col in np.ndindex(adjacency_matrix.shape[:2]):
-            rendered_colour = node_colour
-            if mark_erroneous_nodes and not is_node_planar[row, col]:
-                rendered_colour = node_colour_failure
-            cx = col + 0.5
-            cy = row + 0.5
-            self.svg_renderer.add_circle(Vector2D(cx, cy), node_radius, rendered_colour)
+        is_node_planar = self.get_non_planar_nodes() if mark_erroneous_nodes else np.ones((height, width), dtype=bool)
+
+        rows, cols = np.mgrid[0:height, 0:width]
+        node_centres = np.stack([cols + 0.5, rows + 0.5], axis=-1).reshape(-1, 2)
+        rendered_node_colours = [node_colour if is_planar else node_colour_failure for is_planar in is_node_planar.ravel().tolist()]
+        self.svg_renderer.add_circles(node_centres, node_radius, rendered_node_colours)
         
-        # Add graph edges
-        for row, col in np.ndindex(adjacency_matrix.shape[:2]):
-            for i in range(4):
-                if(adjacency_matrix[row, col, i]):
-                    next_row, next_col = self.get_neighbouring_node(row, col, i)
-                    x1 = col + 0.5
-                    y1 = row + 0.5
-                    x2 = next_col + 0.5
-                    y2 = next_row + 0.5
-                    rendered_colour = edge_colour
-                    if mark_erroneous_nodes\
-                            and i in [0, 2]\
-                            and not is_node_planar[row, col]\
-                            and not is_node_planar[next_row, next_col]\
-                            and not is_node_planar[row, next_col]\
-                            and not is_node_planar[next_row, col]:
-                        rendered_colour = edge_colour_failure
-                    self.svg_renderer.add_line(Vector2D(x1, y1), Vector2D(x2, y2), rendered_colour, edge_width)
+        # Add graph edges. Edges 4 to 7 are mirrors of edges 0 to 3, so only the first 4 edges of each node are drawn.
+        rows, cols, edge_indices = np.argwhere(adjacency_matrix[..., :4]).T
+        next_rows = rows + np.array(_ROW_INC)[edge_indices]
+        next_cols = cols + np.array(_COL_INC)[edge_indices]
+        # Diagonals whose 2x2 block has only non-planar nodes are marked as failures.
+        is_edge_failure = ((edge_indices == 0) | (edge_indices == 2)) \
+            & ~is_node_planar[rows, cols] \
+            & ~is_node_planar[next_rows, next_cols] \
+            & ~is_node_planar[rows, next_cols] \
+            & ~is_node_planar[next_rows, cols]
+        rendered_edge_colours = [edge_colour_failure if is_failure else edge_colour for is_failure in is_edge_failure.tolist()]
+        self.svg_renderer.add_lines(np.stack([cols + 0.5, rows + 0.5], axis=-1),
+                                    np.stack([next_cols + 0.5, next_rows + 0.5], axis=-1),
+                                    rendered_edge_colours, edge_width)
 
     def _set_connected_component_ids(self):
         """
         TODO (P0): Docstring
         """
+        connected_component_ids: NDArray[np.int64] = self.pixel_art_raster.pixel_connected_component_ids
+        if label_connected_components_nb is not None:
+            label_connected_components_nb(self.adjacency_matrix, connected_component_ids)
+            return
+
+        width = connected_component_ids.shape[1]
         num_connected_components: int = 0
-        # visited = np.zeros(self.adjacency_matrix.shape[:2], dtype = bool)
-        for row, col in np.ndindex(self.adjacency_matrix.shape[:2]):
-            pixel: _Pixel = self.pixel_art_raster.pixel_grid[row, col]
-            if pixel.connected_component_id >= 0:
+        for node in range(connected_component_ids.size):
+            row, col = divmod(node, width)
+            if connected_component_ids[row, col] >= 0:
                 continue
 
             component_id: int = num_connected_components
             num_connected_components += 1
-            pixel.connected_component_id = component_id
+            connected_component_ids[row, col] = component_id
             to_visit: list[tuple[int, int]] = [(row, col)]
             while len(to_visit) > 0:
                 r1, c1 = to_visit.pop()
-                for edge_index in range(8):
-                    if not self.adjacency_matrix[r1, c1, edge_index]:
-                        continue
+                for edge_index in _SET_BITS_LUT[self.adjacency_matrix[r1, c1]]:
                     r2, c2 = self.get_neighbouring_node(r1, c1, edge_index)
-                    if r2 < 0 or r2 >= self.pixel_art_raster.pixel_grid.shape[0] or c2 < 0 or c2 >= self.pixel_art_raster.pixel_grid.shape[1]:
-                        continue
-                    pixel2: _Pixel = self.pixel_art_raster.pixel_grid[r2, c2]
-                    if pixel2.connected_component_id >= 0:
+                    if connected_component_ids[r2, c2] >= 0:
                         continue
-                    pixel2.connected_component_id = component_id
+                    connected_component_ids[r2, c2] = component_id
                     to_visit.append((r2, c2))
@@ -7,33 +7,62 @@ from tkinter import filedialog
 from IPython.display import HTML
 
 from svg_renderer import SVGRenderer
-from vector_2d import Vector2D
 from colour import Colour
+from vector_2d import Vector2D
 from verbose_logger import VerboseLogger
 
 # TODO (P2): Implement verbosity for proper debugging
 
 class _Pixel:
     """
-    Internal class to be used by PixelArtRaster class. Contains data for a pixel in the raster.
+    Internal class to be used by PixelArtRaster class. A lightweight view of a pixel in the raster.
+    The pixel data itself is stored in the arrays of the PixelArtRaster object, so views are cheap to create and never go stale.
 
     Attributes:
-        id (int): A unique identifier for the pixel. Used to check equality of two pixels. Must be non-negative.
-        colour (Colour): Colour of the pixel in RGBA format.
-        connected_component_id (int): Two _Pixel objects are in the same connected component if and only if they have the same component ID.
-            A negative ID means the ID is undefined.
+        pixel_art_raster (PixelArtRaster): The raster that the pixel belongs to.
+        row (int): Row index of the pixel in the raster.
+        col (int): Column index of the pixel in the raster.
     """
-    def __init__(self, id: int = None, colour: Colour = None):
+    __slots__ = ('pixel_art_raster', 'row', 'col')
+
+    def __init__(self, pixel_art_raster: 'PixelArtRaster', row: int, col: int):
         """
         Initialise a _Pixel object.
 
         Args:
-            id (int): A unique identifier for the pixel. Used to check equality of two pixels. Must be non-negative.
-            colour (Colour): Colour of the pixel in RGBA format.
+            pixel_art_raster (PixelArtRaster): The raster that the pixel belongs to.
+            row (int): Row index of the pixel in the raster.
+            col (int): Column index of the pixel in the raster.
+        """
+        self.pixel_art_raster: PixelArtRaster = pixel_art_raster
+        self.row: int = row
+        self.col: int = col
+
+    @property
+    def id(self) -> int:
+        """
+        A unique identifier for the pixel. Used to check equality of two pixels. Non-negative.
+        """
+        return int(self.pixel_art_raster.pixel_ids[self.row, self.col])
+
+    @property
+    def colour(self) -> Colour:
+        """
+        Colour of the pixel in RGBA format.
+        """
+        return Colour(self.pixel_art_raster.pixel_colours[self.row, self.col])
+
+    @property
+    def connected_component_id(self) -> int:
+        """
+        Two pixels are in the same connected component if and only if they have the same component ID.
+        A negative ID means the ID is undefined.
         """
-        self.id: int = id
-        self.colour: Colour = colour
-        self.connected_component_id: int = -1
+        return int(self.pixel_art_raster.pixel_connected_component_ids[self.row, self.col])
+
+    @connected_component_id.setter
+    def connected_component_id(self, connected_component_id: int):
+        self.pixel_art_raster.pixel_connected_component_ids[self.row, self.col] = connected_component_id
     
     def __eq__(self, other) -> bool:
         """
@@ -42,7 +71,8 @@ class _Pixel:
         Returns:
             bool: True if both IDs are non-negative and equal, False otherwise.
         """
-        return self.id >= 0 and self.id == other.idf
+        pixel_id = self.id
+        return pixel_id >= 0 and pixel_id == other.id
 
 class PixelArtRaster:
     """
@@ -52,7 +82,13 @@ class PixelArtRaster:
         input_raster (NDArray[uint64]): The input raster stored in the shape (height, width, 4), in RGBA format.
         reduce_input_raster (bool): If True, the input raster is reduced if it is a scaled up image.
         svg_scale_factor (int): Specify how big each square of the raster should be when rendering.
-        pixel_grid (NDArray[_Pixel]): A 2D grid of _Pixel objects having shape (height, width)
+        pixel_colours (NDArray[uint8]): Colours of the pixels in RGBA format, having shape (height, width, 4).
+            C-contiguous, so it can be viewed as uint32 to compare whole colours with a single operation.
+        pixel_ids (NDArray[int64]): Unique identifier of each pixel, having shape (height, width). C-contiguous.
+        pixel_connected_component_ids (NDArray[int64]): Connected component ID of each pixel, having shape (height, width).
+            Two pixels are in the same connected component if and only if they have the same component ID. A negative ID means the ID is undefined.
+        pixel_count (int): Number of pixels in the raster. Read-only.
+        pixel_grid (NDArray[_Pixel]): A 2D grid of _Pixel views having shape (height, width). Read-only, and built on each access.
         verbosity (int): Specify the verbosity level. Defaults to 0. They are defined as follows:
             0: Silent
             1: Warnings
@@ -78,10 +114,11 @@ class PixelArtRaster:
                 2: Warnings and info
                 3: Warnings, info, and debug logs
         """
-        self.pixel_count: int = 0
         self.input_raster: NDArray[np.uint64] = input_raster
         self.reduce_input_raster: bool = reduce_input_raster
-        self.pixel_grid: NDArray[_Pixel] = None
+        self.pixel_colours: NDArray[np.uint8] = None
+        self.pixel_ids: NDArray[np.int64] = None
+        self.pixel_connected_component_ids: NDArray[np.int64] = None
         self.input_raster_file_path: str = None # TODO (P1): Move this variable and its functionality to another class
         self.svg_renderer: SVGRenderer = SVGRenderer(svg_scale_factor)
 
@@ -91,6 +128,29 @@ class PixelArtRaster:
 
 # PUBLIC
 
+    @property
+    def pixel_count(self) -> int:
+        """
+        Number of pixels in the raster, including the padding.
+        """
+        if self.pixel_ids is None:
+            return 0
+        return self.pixel_ids.size
+
+    @property
+    def pixel_grid(self) -> NDArray[_Pixel]:
+        """
+        A 2D grid of _Pixel views having shape (height, width), or None if no raster has been imported.
+        The grid is built on each access. Use get_pixel() to access a single pixel.
+        """
+        if self.pixel_ids is None:
+            return None
+        height, width = self.pixel_ids.shape
+        pixel_grid = np.empty((height, width), dtype=object)
+        for row, col in np.ndindex(height, width):
+            pixel_grid[row, col] = self.get_pixel(row, col)
+        return pixel_grid
+
     # Import an input raster image.
     # If none is specified via parameter, create a window to allow user to select a PNG.
     def import_input_raster(self,
@@ -137,14 +197,24 @@ class PixelArtRaster:
         Return a deep copy of the pixel art image in RGBA format.
 
         Returns:
-            NDArray[uint64]: Pixel art image having shape (height, width, 4)
+            NDArray[uint8]: Pixel art image having shape (height, width, 4)
         """
-        pixel_art_image: NDArray[np.uint64] = np.zeros((self.pixel_grid.shape[0], self.pixel_grid.shape[1], 4))
-        for row, col in np.ndindex(pixel_art_image.shape[:2]):
-            pixel_art_image[row, col] = np.array(self.pixel_grid[row, col].colour)
-        
+        pixel_art_image: NDArray[np.uint8] = np.copy(self.pixel_colours)
         return pixel_art_image
 
+    def get_pixel(self, row: int, col: int) -> _Pixel:
+        """
+        Return a view of the pixel at the given position.
+
+        Args:
+            row (int): Row index of the pixel, from 0 to height-1 (inclusive).
+            col (int): Column index of the pixel, from 0 to width-1 (inclusive).
+
+        Returns:
+            _Pixel: View of the pixel that reads its data from this raster.
+        """
+        return _Pixel(self, row, col)
+
     def render(self):
         """
         Method to render the pixel art image in SVG format, as per the specified `svg_scale_factor`
@@ -154,7 +224,7 @@ class PixelArtRaster:
         """
         self.svg_renderer.clear()
         self._set_svg_pixel_elements()
-        self.logger.info(f'Rendering pixel grid of shape {self.pixel_grid.shape}')
+        self.logger.info(f'Rendering pixel grid of shape {self.pixel_colours.shape[:2]}')
         return HTML(self.svg_renderer.get_html_code_for_svg())
 
     # Export the pixel art PNG image. If no path is specified, overwrite the input raster.
@@ -163,26 +233,11 @@ class PixelArtRaster:
         if export_path is None:
             export_path = self.input_raster_file_path
 
-        saved_art = cv2.cvtColor(self.pixel_grid, cv2.COLOR_BGRA2RGBA)
+        saved_art = cv2.cvtColor(self.pixel_colours, cv2.COLOR_BGRA2RGBA)
         cv2.imwrite(export_path, saved_art)
 
 # PRIVATE
 
-    def _create_pixel(self, colour: Colour) -> _Pixel:
-        """
-        Method to create a new pixel. This method handles ID allocation for the pixel grid.
-
-        Args:
-            colour (Colour): Colour of the pixel in RGBA format
-        
-        Returns:
-            _Pixel: The pixel object with a new ID and specified colour
-        """
-        id = self.pixel_count
-        self.pixel_count += 1
-        new_pixel = _Pixel(id, colour)
-        return new_pixel
-
     def _create_pixel_grid(self, image: NDArray[np.uint64]):
         """
         Create the pixel grid array for the given RGBA image
@@ -190,38 +245,38 @@ class PixelArtRaster:
         Args:
             image (NDArray[uint64]): Input image in RGBA format
         """
-        self.logger.info(f'Creating a pixel grid of the image with _Pixel objects')
+        self.logger.info(f'Creating a pixel grid of the image')
         if image is None:
             self.logger.warning('No input image found. No pixel grid is created')
             return
         
-        self.pixel_grid = np.empty(image.shape[:2], dtype = object)
-        for row, col in np.ndindex(image.shape[:2]):
-            colour = Colour(image[row, col])
-            self.pixel_grid[row, col] = self._create_pixel(colour)
-        self.logger.info(f'Created pixel grid of size {self.pixel_grid.shape}')
+        self.pixel_colours = np.array(image, dtype=np.uint8, order='C')
+        self.pixel_ids = np.arange(image.shape[0]*image.shape[1], dtype=np.int64).reshape(image.shape[:2])
+        self.pixel_connected_component_ids = np.full(image.shape[:2], -1, dtype=np.int64)
+        self.logger.info(f'Created pixel grid of size {self.pixel_colours.shape[:2]}')
 
     def add_padding_to_pixel_grid(self):
         """
         Add a 1 transparent pixel padding to the borders of the image pixel grid
         """
         self.logger.info(f'Adding padding to pixel grid')
-        old_pixel_grid: NDArray[_Pixel] = self.pixel_grid
-        self.pixel_grid = np.empty((old_pixel_grid.shape[0]+2, old_pixel_grid.shape[1]+2), dtype=object)
-
-        # Copy referernces to existing pixels
-        for row, col in np.ndindex(old_pixel_grid.shape[:2]):
-            self.pixel_grid[row+1, col+1] = old_pixel_grid[row, col]
-
-        # Add transparent pixels to borders
-        transparent_colour: Colour = old_pixel_grid[0,0].colour
-        for row in range(self.pixel_grid.shape[0]):
-            self.pixel_grid[row][0] = self._create_pixel(transparent_colour)
-            self.pixel_grid[row][self.pixel_grid.shape[1]-1] = self._create_pixel(transparent_colour)
-        for col in range(1, self.pixel_grid.shape[1]-1):
-            self.pixel_grid[0][col] = self._create_pixel(transparent_colour)
-            self.pixel_grid[self.pixel_grid.shape[0]-1][col] = self._create_pixel(transparent_colour)
-        self.logger.info(f'Addition of padding is complete. Updated grid shape is {self.pixel_grid.shape}')
+        old_shape = self.pixel_colours.shape[:2]
+        new_shape = (old_shape[0]+2, old_shape[1]+2)
+
+        # Zero padding is fully transparent in RGBA format
+        self.pixel_colours = np.pad(self.pixel_colours, ((1, 1), (1, 1), (0, 0)))
+
+        # The IDs of a grid are always 0 to (number of pixels - 1), so border pixels get the IDs after the existing ones.
+        # Existing pixels keep theirs
+        is_border = np.ones(new_shape, dtype=bool)
+        is_border[1:-1, 1:-1] = False
+        pixel_ids = np.empty(new_shape, dtype=np.int64)
+        pixel_ids[is_border] = np.arange(self.pixel_ids.size, pixel_ids.size, dtype=np.int64)
+        pixel_ids[1:-1, 1:-1] = self.pixel_ids
+        self.pixel_ids = pixel_ids
+
+        self.pixel_connected_component_ids = np.pad(self.pixel_connected_component_ids, 1, constant_values=-1)
+        self.logger.info(f'Addition of padding is complete. Updated grid shape is {self.pixel_colours.shape[:2]}')
 
     def _remove_all_padding_from_image(self) -> NDArray[np.uint64]:
 
@@ -271,40 +326,48 @@ class PixelArtRaster:
             self.logger.warning(f'No input raster image found')
             return None
 
-        pixel_size = 0
-
-        for row in range(self.input_raster.shape[0]):
-            row_pixel_size = 0
-            curr_pixel_size = 1
-            log_list = []
-            curr_colour = self.input_raster[row,0]
-            for col in range(1, self.input_raster.shape[1]):
-                pixel_color = self.input_raster[row,col]
-                if (pixel_color == curr_colour).all():
-                    curr_pixel_size += 1
-                else:
-                    row_pixel_size = math.gcd(curr_pixel_size, row_pixel_size)
-                    log_list.append(curr_pixel_size)
-                    curr_pixel_size = 1
-                    curr_colour = pixel_color
-            pixel_size = math.gcd(row_pixel_size, pixel_size)
-            # self.logger.debug(f'Pixel size at row {row} is: {row_pixel_size}. GCD so far: {pixel_size}. {log_list}')
-        # TODO (P2): Do the same vertically as well
-        # In most cases, doing horizontally is enough. Checking vertically would help with robustness.
+        # Every run of identical colours must be a multiple of the pixel size, both horizontally and vertically.
+        # The last run of each row and column is skipped, since the image may be cropped in the middle of a pixel.
+        # RGBA rasters are packed into one 32-bit word per pixel, so each pair of pixels is compared in a single operation.
+        if self.input_raster.dtype == np.uint8 and self.input_raster.shape[-1] == 4:
+            packed_raster = np.ascontiguousarray(self.input_raster).view(np.uint32)[:, :, 0]
+            horizontal_changes = packed_raster[:, 1:] != packed_raster[:, :-1]
+            vertical_changes = (packed_raster[1:, :] != packed_raster[:-1, :]).T
+        else:
+            horizontal_changes = (self.input_raster[:, 1:] != self.input_raster[:, :-1]).any(axis=-1)
+            vertical_changes = (self.input_raster[1:, :] != self.input_raster[:-1, :]).any(axis=-1).T
+        pixel_size = math.gcd(self._get_run_length_gcd(horizontal_changes), self._get_run_length_gcd(vertical_changes))
 
         if pixel_size < 1:
             pixel_size = 1
 
         self.logger.debug(f'Each square in the input image is found to occupy {pixel_size} pixels')
 
-        pixel_art = np.zeros((self.input_raster.shape[0]//pixel_size, self.input_raster.shape[1]//pixel_size, 4), dtype=np.uint8)
-        for row, col in np.ndindex(pixel_art.shape[:2]):
-            pixel_art[row][col] = self.input_raster[row*pixel_size][col*pixel_size]
+        height, width = self.input_raster.shape[0]//pixel_size, self.input_raster.shape[1]//pixel_size
+        pixel_art = self.input_raster[:height*pixel_size:pixel_size, :width*pixel_size:pixel_size].astype(np.uint8)
 
         self.logger.debug(f'Updated pixel art will have a shape of {pixel_art.shape}')
         self.logger.info(f'Completed reduction of input raster')
         return pixel_art
 
+    @staticmethod
+    def _get_run_length_gcd(changes: NDArray[bool]) -> int:
+        """
+        Get the GCD of the lengths of all runs of identical colours that end before the last column.
+
+        Args:
+            changes (NDArray[bool]): Array of shape (rows, cols-1) that is True where a pixel differs from the next one in its row.
+
+        Returns:
+            int: GCD of the run lengths. 0 if no row has a colour change.
+        """
+        rows, cols = np.nonzero(changes)
+        run_ends = cols + 1
+        run_starts = np.zeros_like(run_ends)
+        is_same_row = rows[1:] == rows[:-1]
+        run_starts[1:][is_same_row] = run_ends[:-1][is_same_row]
+        return int(np.gcd.reduce(run_ends - run_starts)) if run_ends.size > 0 else 0
+
     def _select_input_raster_from_window(self) -> NDArray[np.uint64]:
         """
         Method to prompt the user to select an input PNG image from their system
@@ -323,16 +386,24 @@ class PixelArtRaster:
         self.input_raster_file_path = file_path
 
         img = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
-        input_raster = cv2.cvtColor(img, cv2.COLOR_BGRA2RGBA)
+        # PNGs without an alpha channel are decoded as BGR, so an opaque alpha channel is added in the same conversion.
+        if img.shape[2] == 3:
+            input_raster = cv2.cvtColor(img, cv2.COLOR_BGR2RGBA)
+        else:
+            input_raster = cv2.cvtColor(img, cv2.COLOR_BGRA2RGBA)
         return input_raster
     
     def _set_svg_pixel_elements(self):
         """
-        For each pixel in the pixel grid, create an SVG element that can be rendered by the SVG renderer
+        For each visible pixel in the pixel grid, create an SVG element that can be rendered by the SVG renderer.
+        Fully transparent pixels (such as the padding) are skipped, but the canvas still covers the whole grid.
         """
         # TODO (P4): Validate that pixel_art has the correct shape and data type. Throw exception if not 
-        for row, col in np.ndindex(self.pixel_grid.shape[:2]):
-            pixel_colour: Colour = self.pixel_grid[row, col].colour
-            pixel_position = Vector2D(col, row)
-
-            self.svg_renderer.add_square(colour = pixel_colour, position = pixel_position)
\ No newline at end of file
+        height, width = self.pixel_colours.shape[:2]
+        visible_rows, visible_cols = np.nonzero(self.pixel_colours[:, :, 3])
+        pixel_positions = np.stack([visible_cols, visible_rows], axis=-1)
+        self.svg_renderer.add_squares(
+            pixel_positions,
+            self.pixel_colours[visible_rows, visible_cols],
+            bound_point = Vector2D(width, height)
+        )
\ No newline at end of file
@@ -10,17 +10,51 @@ from vector_2d import Vector2D
 from colour import Colour
 from svg_renderer import SVGRenderer
 
+try:
+    from _pvg_numba import trace_edge_walks_nb, wire_edges_nb
+except ImportError:
+    # Numba is optional. Without it, the pure Python implementations below are used.
+    trace_edge_walks_nb = wire_edges_nb = None
+
+# Position (x,y) of each pixel vector graph node relative to the top-left corner of its grid box, indexed as in graph_nodes_grid_box.
+_NODE_POSITION_OFFSETS: NDArray[np.float64] = np.array([
+    [0.5, 0.5],
+    [0.25, 0.25],
+    [0.75, 0.25],
+    [0.75, 0.75],
+    [0.25, 0.75],
+    [0.5, 0],
+    [1, 0.5],
+    [0.5, 1],
+    [0, 0.5]
+], dtype=np.float64)
+
+# Points of the Bezier curves drawn for an edge, as indices into (edge centre, end node, next edge centre).
+# Edges ending in a vertex of degree 4 or more are drawn as 2 straight line segments through the vertex, indexed by 1.
+# Other edges are drawn as a single quadratic Bezier curve, indexed by 0, whose second row is never drawn.
+# TODO (P0): The line segment logic should be applied to degree 4 vertices only and not degree 3
+_EDGE_BEZIER_CURVE_POINT_INDICES: NDArray[np.intp] = np.array([
+    [[0, 1, 2], [0, 1, 2]],
+    [[0, 0, 1], [1, 1, 2]]
+], dtype=np.intp)
+
+# Lines whose intersection denominator is smaller than this in magnitude are treated as parallel. Nearly parallel lines would
+# otherwise intersect far away from the points defining them.
+_PARALLEL_LINES_TOLERANCE: float = 1e-12
+
 class _PixelVectorGraphNode:
     """
     Internal class to be used by PixelVectorGraph. Contains data for nodes of the pixel vector graph.
 
     Attributes:
-        id (int): A unique identifier for the node. Used to check equality of two nodes.
+        id (int): A unique identifier for the node. Nodes are compared and hashed by object identity, as IDs are reassigned.
         position (Vector2D): Position of the node in (x,y) coordinates. Defaults to origin (0,0)
         offset (Vector2D): Applies an offset to the node's position in (x,y) coordinates. Defaults to (0,0)
         edge_list (_PixelVectorGraphEdge): A list of edges that originate from this node.
         is_locked (bool): If True, the offset of this node will not be changed.
     """
+    __slots__ = ('id', 'position', 'offset', 'edge_list', 'is_locked')
+
     def __init__(
             self,
             id: int = -1,
@@ -31,7 +65,7 @@ class _PixelVectorGraphNode:
         Initialise a _PixelVectorGraphNode object.
 
         Args:
-            id (int): A unique identifier for the node. Used to check equality of two nodes
+            id (int): A unique identifier for the node.
             position (Vector2D): Position of the node in (x,y) coordinates. Defaults to origin (0,0)
             offset (Vector2D): Applies an offset to the node's position in (x,y) coordinates. Defaults to (0,0)
         """
@@ -41,15 +75,6 @@ class _PixelVectorGraphNode:
         self.edge_list: list[_PixelVectorGraphEdge] = []
         self.is_locked: bool = False
 
-    def __eq__(self, other) -> bool:
-        """
-        Two nodes are equal if both nodes have a non-negative ID and both IDs are equal.
-
-        Returns:
-            bool: True if both IDs are non-negative and equal, False otherwise.
-        """
-        return self.id >= 0 and self.id == other.id
-
     def get_coordinates(self) -> Vector2D:
         """
         Returns coordinates of the node as a Vector2D object.
@@ -57,7 +82,7 @@ class _PixelVectorGraphNode:
         Returns:
             Vector2D: Coordinates of the node based on position and offset.
         """
-        return self.position + self.offset
+        return Vector2D(self.position.x + self.offset.x, self.position.y + self.offset.y)
     
     def get_degree(self) -> int:
         """
@@ -127,6 +152,8 @@ class _PixelVectorGraphEdge:
         opposite_edge (_PixelVectorGraphEdge): The edge that is pointing in the opposite direction to this edge.
         is_dead_end_edge (bool): True if the Bezier curve of this edge does not connect to the following edge, False otherwise.
     """
+    __slots__ = ('id', 'start_node', 'end_node', 'pixel', 'next_edge', 'opposite_edge', 'is_dead_end_edge')
+
     def __init__(
             self,
             id: int = -1,
@@ -172,7 +199,12 @@ class _PixelVectorGraphEdge:
         Returns:
             Vector2D: The center point of the edge.
         """
-        return (self.start_node.get_coordinates() + self.end_node.get_coordinates()) / 2
+        start_position, start_offset = self.start_node.position, self.start_node.offset
+        end_position, end_offset = self.end_node.position, self.end_node.offset
+        return Vector2D(
+            ((start_position.x + start_offset.x) + (end_position.x + end_offset.x)) / 2,
+            ((start_position.y + start_offset.y) + (end_position.y + end_offset.y)) / 2
+        )
     
     def get_b_spline_points(self) -> tuple[Vector2D, Vector2D, Vector2D]:
         """
@@ -189,16 +221,6 @@ class _PixelVectorGraphEdge:
 
         return (p0, p1, p2)
     
-    def bezier_curve_curvature(self, p0: Vector2D, p1: Vector2D, p2: Vector2D, t: float) -> float:
-        """
-        TODO (P0): Docstring
-        """
-        d0: Vector2D = p1 - p0
-        d1: Vector2D = p2 - p1
-
-        kappa_t: float = abs(d0.x*d1.y - d1.x*d0.y) / (2 * float((1-t)*d0 + t*d1)**3)
-        return kappa_t
-
     def get_b_spline_curvature_discrete_integral(self, num_samples: int = 10):
         """
         TODO (P0): Docstring
@@ -207,11 +229,19 @@ class _PixelVectorGraphEdge:
             return 0
 
         p0, p1, p2 = self.get_b_spline_points()
+        d0_x, d0_y = p1.x - p0.x, p1.y - p0.y
+        d1_x, d1_y = p2.x - p1.x, p2.y - p1.y
+        # The curvature of a quadratic Bezier curve at t is |d0 x d1| / (2 * |(1-t)*d0 + t*d1|^3).
+        # The numerator does not depend on t, and the components are used directly to avoid temporary Vector2D objects.
+        cross_product = abs(d0_x*d1_y - d1_x*d0_y)
         integral = 0
 
         for i in range(num_samples):
             t = i / num_samples
-            integral += self.bezier_curve_curvature(p0, p1, p2, t) / num_samples
+            derivative_x = d0_x*(1-t) + d1_x*t
+            derivative_y = d0_y*(1-t) + d1_y*t
+            kappa_t: float = cross_product / (2 * ((derivative_x ** 2 + derivative_y ** 2) ** 0.5)**3)
+            integral += kappa_t / num_samples
         return integral
 
 
@@ -226,8 +256,8 @@ class PixelVectorGraph:
         number_of_edges (int): Number of edges in the pixel vector graph.
         graph_nodes_list (list[_PixelVectorGraphNode]): List of nodes in the pixel vector graph.
         graph_edges_list (list[_PixelVectorGraphEdge]): List of edges in the pixel vector graph.
-        graph_nodes_grid_box (NDArray[_PixelVectorGraphNode]): Nodes of the pixel vector graph stored in an array
-            of shape (width-1, height-1, 9). For each pixel (other than the rightmost and lowermost), the pixel vector
+        graph_nodes_grid_box (NDArray[int32]): IDs of the nodes of the pixel vector graph stored in an array
+            of shape (height-1, width-1, 9), as created by construct_dual_graph(). For each pixel (other than the rightmost and lowermost), the pixel vector
             graph nodes are visually indexed as follows: 
 
             # - 5 - -
@@ -238,6 +268,7 @@ class PixelVectorGraph:
 
             Note that the node at index 6 is same as the node at index 8 on the right pixel.
             Similarly, the node at index 7 is same as the node at index 5 on the lower pixel.
+            simplify_dual_graph() renumbers the IDs to match the simplified graph, and sets the IDs of the removed nodes to -1.
         svg_renderer (SVGRenderer): SVG Renderer object to store and render SVG elements.
     """
     def __init__(self, pixel_art_raster: PixelArtRaster = None, adjacency_graph: PixelAdjacencyGraph = None):
@@ -254,8 +285,10 @@ class PixelVectorGraph:
         self.number_of_edges: int = 0
         self.graph_nodes_list: list[_PixelVectorGraphNode] = []
         self.graph_edges_list: list[_PixelVectorGraphEdge] = []
-        self.graph_nodes_grid_box: NDArray[_PixelVectorGraphNode] = []
+        self.graph_nodes_grid_box: NDArray[np.int32] = []
         self.svg_renderer: SVGRenderer = SVGRenderer()
+        # Edges created by _create_new_edge whose opposite edge has not been created yet, keyed by (start node ID, end node ID)
+        self._unpaired_edges: dict[tuple[int, int], _PixelVectorGraphEdge] = {}
 
 # PUBLIC
     
@@ -319,8 +352,14 @@ class PixelVectorGraph:
         """
         In the computed dual graph, remove all vertices with a degree of 2, then remove all edges that do not have a distinct colour boundary.
         """
+        # Removing a node does not change the degree of any other node, so the remaining nodes are compacted in the same pass.
+        simplified_nodes_list = []
+        new_node_ids = np.full(self.number_of_nodes, -1, dtype=np.int32)
         for node in self.graph_nodes_list:
             if len(node.edge_list) != 2:
+                new_node_ids[node.id] = len(simplified_nodes_list)
+                node.id = len(simplified_nodes_list)
+                simplified_nodes_list.append(node)
                 continue
             edge0: _PixelVectorGraphEdge = node.edge_list[0]
             edge1: _PixelVectorGraphEdge = node.edge_list[1]
@@ -339,8 +378,12 @@ class PixelVectorGraph:
             node.edge_list = []
             node.id = -1
 
-        self._delete_unallocated_nodes()
-        self._delete_unallocated_edges()
+        self.graph_nodes_list = simplified_nodes_list
+        self.number_of_nodes = len(self.graph_nodes_list)
+        if len(self.graph_nodes_grid_box):
+            self.graph_nodes_grid_box = new_node_ids[self.graph_nodes_grid_box]
+
+        # The removed edges are deleted together with the edges without a colour boundary, in a single compaction.
         self._delete_edges_without_colour_boundary()
 
     # TODO (P0): Implement this method
@@ -349,42 +392,30 @@ class PixelVectorGraph:
         Each vertex of degree 3 in the simplified dual graph marks a T-junction. One edge ending at each of these needs to be marked as a dead-end edge
         before applying curves to each edge.
         """
-        for node in self.graph_nodes_list:
-            if len(node.edge_list) != 3:
-                continue
-            outward_edges = node.edge_list
-            inward_edges = [edge.opposite_edge for edge in outward_edges]
-            next_nodes = [edge.end_node for edge in outward_edges]
-
-            node_positions = [next_node.get_coordinates() - node.get_coordinates() for next_node in next_nodes]
-            node_positions = [Vector2D(p.x, -p.y) for p in node_positions]
-            node_angles = []
-            for position in node_positions:
-                angle = math.pi / 2
-                if position.x == 0:
-                    if position.y < 0:
-                        angle = 3 * math.pi / 2
-                else:
-                    angle = math.atan(position.y / position.x)
-                    if position.x < 0:
-                        if position.y < 0:
-                            angle = math.pi + angle
-                        else:
-                            angle = math.pi + angle
-                while angle < 0:
-                    angle += 2 * math.pi
-                node_angles.append(angle)
-            
-            angle_01 = min(abs(node_angles[0] - node_angles[1]), 2*math.pi - abs(node_angles[0] - node_angles[1]))
-            angle_12 = min(abs(node_angles[1] - node_angles[2]), 2*math.pi - abs(node_angles[1] - node_angles[2]))
-            angle_20 = min(abs(node_angles[2] - node_angles[0]), 2*math.pi - abs(node_angles[2] - node_angles[0]))
-
-            if max(angle_01, angle_12, angle_20) == angle_01:
-                inward_edges[2].is_dead_end_edge = True
-            if max(angle_01, angle_12, angle_20) == angle_12:
-                inward_edges[0].is_dead_end_edge = True
-            if max(angle_01, angle_12, angle_20) == angle_20:
-                inward_edges[1].is_dead_end_edge = True
+        t_junction_nodes = [node for node in self.graph_nodes_list if len(node.edge_list) == 3]
+        if len(t_junction_nodes) == 0:
+            return
+
+        # Displacement from each T-junction node to the end node of each of its 3 edges, of shape (K, 3, 2)
+        edge_displacements = np.array([
+            [tuple(edge.end_node.get_coordinates() - node.get_coordinates()) for edge in node.edge_list]
+            for node in t_junction_nodes
+        ], dtype=np.float64)
+
+        # Angle of each edge in [0, 2*pi), measured anticlockwise with y pointing upwards
+        edge_angles = np.mod(np.arctan2(-edge_displacements[:, :, 1], edge_displacements[:, :, 0]), 2*math.pi)
+
+        # Angle between edges 0 and 1, 1 and 2, and 2 and 0 respectively, of shape (K, 3)
+        angle_differences = np.abs(edge_angles - edge_angles[:, [1, 2, 0]])
+        angles_between_edges = np.minimum(angle_differences, 2*math.pi - angle_differences)
+
+        # The edge opposite to the widest angle is the stem of the T-junction.
+        # The widest angle between edges k and k+1 is opposite to edge k+2. If several angles are equally wide, the first one is used,
+        # so that each T-junction has exactly one dead-end edge.
+        widest_angle_indices = np.argmax(angles_between_edges, axis=1)
+        for node, angle_index in zip(t_junction_nodes, widest_angle_indices.tolist()):
+            dead_end_outward_edge = node.edge_list[(angle_index + 2) % 3]
+            dead_end_outward_edge.opposite_edge.is_dead_end_edge = True
     
     def smoothen_vectorised_image(self, num_iterations: int = 20, num_samples_per_iteration: int = 10, sample_space_radius = 0.2):
         for iteration in range(num_iterations):
@@ -397,138 +428,123 @@ class PixelVectorGraph:
 
     def _initialize_graph_nodes(self):
         """
-        Create nodes for the pixel vector graph and add them in graph_nodes_grid_box.
+        Create nodes for the pixel vector graph and add their IDs in graph_nodes_grid_box.
         """
         # TODO (P4): If adjacency_graph is None, throw an exception
-        adjacency_matrix = self.adjacency_graph.get_adjacency_matrix()
-        self.graph_nodes_grid_box = np.empty((adjacency_matrix.shape[0]-1, adjacency_matrix.shape[1]-1, 9), dtype=object)
-
-        # Create the nodes for the top-left grid box
-        for index in range(9):
-            node_position = self._get_node_position(Vector2D(0, 0), index)
-            self.graph_nodes_grid_box[0, 0, index] = self._create_new_node(node_position)
-
-        # Create the nodes for each of the left column grid boxes
-        for row in range(1, self.graph_nodes_grid_box.shape[0]):
-            for index in [0, 1, 2, 3, 4, 6, 7, 8]:
-                node_position = self._get_node_position(Vector2D(0, row), index)
-                self.graph_nodes_grid_box[row, 0, index] = self._create_new_node(node_position)
-            self.graph_nodes_grid_box[row, 0, 5] = self.graph_nodes_grid_box[row-1, 0, 7]
-
-        # Create the nodes of each of the top row grid boxes
-        for col in range(1, self.graph_nodes_grid_box.shape[1]):
-            for index in range(8):
-                node_position = self._get_node_position(Vector2D(col, 0), index)
-                self.graph_nodes_grid_box[0, col, index] = self._create_new_node(node_position)
-            self.graph_nodes_grid_box[0, col, 8] = self.graph_nodes_grid_box[0, col-1, 6]
-        
-        # Create the rest of the nodes
-        for row in range(1, self.graph_nodes_grid_box.shape[0]):
-            for col in range(1, self.graph_nodes_grid_box.shape[1]):
-                for index in [0, 1, 2, 3, 4, 6, 7]:
-                    node_position = self._get_node_position(Vector2D(col, row), index)
-                    self.graph_nodes_grid_box[row, col, index] = self._create_new_node(node_position)
-                self.graph_nodes_grid_box[row, col, 5] = self.graph_nodes_grid_box[row-1, col, 7]
-                self.graph_nodes_grid_box[row, col, 8] = self.graph_nodes_grid_box[row, col-1, 6]
-
+        height, width = self.adjacency_graph.get_adjacency_bitmask(deep_copy=False).shape
+        num_rows, num_cols = height-1, width-1
+        self.graph_nodes_grid_box = np.empty((num_rows, num_cols, 9), dtype=np.int32)
+
+        # Node 5 of each grid box below the top row is node 7 of the grid box above it, and node 8 of each grid box right of
+        # the left column is node 6 of the grid box to its left. Every other node is created by its own grid box.
+        is_created_node = np.ones((num_rows, num_cols, 9), dtype=bool)
+        is_created_node[1:, :, 5] = False
+        is_created_node[:, 1:, 8] = False
+
+        # Nodes are numbered by grid box, first the top-left grid box, then the left column, the top row and the remaining
+        # grid boxes in raster order. Nodes within a grid box are numbered in order of their index.
+        grid_box_order = np.empty((num_rows, num_cols), dtype=np.intp)
+        grid_box_order[:, 0] = np.arange(num_rows)
+        grid_box_order[0, 1:] = np.arange(num_rows, num_rows + num_cols - 1)
+        grid_box_order[1:, 1:] = np.arange(num_rows + num_cols - 1, num_rows * num_cols).reshape(num_rows - 1, num_cols - 1)
+        created_node_grid_box_order = np.broadcast_to(grid_box_order[:, :, np.newaxis], is_created_node.shape)[is_created_node]
+
+        # Flat index in graph_nodes_grid_box of each created node, in order of node ID
+        created_node_indices = np.flatnonzero(is_created_node)[np.argsort(created_node_grid_box_order, kind='stable')]
+        first_node_id = self.number_of_nodes
+        self.graph_nodes_grid_box.reshape(-1)[created_node_indices] = np.arange(first_node_id, first_node_id + len(created_node_indices))
+        self.graph_nodes_grid_box[1:, :, 5] = self.graph_nodes_grid_box[:-1, :, 7]
+        self.graph_nodes_grid_box[:, 1:, 8] = self.graph_nodes_grid_box[:, :-1, 6]
+
+        # Position of every created node, computed in one broadcasted addition
+        grid_box_positions = np.stack(np.meshgrid(np.arange(num_cols), np.arange(num_rows)), axis=-1)
+        node_positions = (grid_box_positions[:, :, np.newaxis, :] + _NODE_POSITION_OFFSETS).reshape(-1, 2)[created_node_indices]
+
+        self.graph_nodes_list.extend(
+            _PixelVectorGraphNode(node_id, Vector2D(x, y))
+            for node_id, x, y in zip(range(first_node_id, first_node_id + len(created_node_indices)),
+                                     node_positions[:, 0].tolist(), node_positions[:, 1].tolist())
+        )
+        self.number_of_nodes = len(self.graph_nodes_list)
 
     def _initialize_graph_edges(self):
         """
         Create edges for the pixel vector graph.
         The edge structure is determined based on the structure of the adjacency graph.
         """
-        adjacency_matrix = self.adjacency_graph.get_adjacency_matrix()
-
-        # For each grid box, initialise the internal edges
-        for row, col in np.ndindex(self.graph_nodes_grid_box.shape[:2]):
-            # If dexter diagonal is present
-            if adjacency_matrix[row, col, 7]:
-                grid_box = self.graph_nodes_grid_box[row, col]
-                pixel_grid = self.pixel_art_raster.pixel_grid
-                e52 = self._create_new_edge(grid_box[5], grid_box[2], pixel_grid[row, col])
-                e24 = self._create_new_edge(grid_box[2], grid_box[4], pixel_grid[row, col])
-                e48 = self._create_new_edge(grid_box[4], grid_box[8], pixel_grid[row, col])
-                e62 = self._create_new_edge(grid_box[6], grid_box[2], pixel_grid[row, col+1])
-                e25 = self._create_new_edge(grid_box[2], grid_box[5], pixel_grid[row, col+1])
-                e84 = self._create_new_edge(grid_box[8], grid_box[4], pixel_grid[row+1, col])
-                e47 = self._create_new_edge(grid_box[4], grid_box[7], pixel_grid[row+1, col])
-                e74 = self._create_new_edge(grid_box[7], grid_box[4], pixel_grid[row+1, col+1])
-                e42 = self._create_new_edge(grid_box[4], grid_box[2], pixel_grid[row+1, col+1])
-                e26 = self._create_new_edge(grid_box[2], grid_box[6], pixel_grid[row+1, col+1])
-
-                e52.set_opposite_edge(e25)
-                e24.set_opposite_edge(e42)
-                e48.set_opposite_edge(e84)
-                e62.set_opposite_edge(e26)
-                e47.set_opposite_edge(e74)
-
-            # If sinister diagonal is present
-            elif adjacency_matrix[row+1, col, 2]:
-                grid_box = self.graph_nodes_grid_box[row, col]
-                pixel_grid = self.pixel_art_raster.pixel_grid
-                e51 = self._create_new_edge(grid_box[5], grid_box[1], pixel_grid[row, col])
-                e18 = self._create_new_edge(grid_box[1], grid_box[8], pixel_grid[row, col])
-                e63 = self._create_new_edge(grid_box[6], grid_box[3], pixel_grid[row, col+1])
-                e31 = self._create_new_edge(grid_box[3], grid_box[1], pixel_grid[row, col+1])
-                e15 = self._create_new_edge(grid_box[1], grid_box[5], pixel_grid[row, col+1])
-                e81 = self._create_new_edge(grid_box[8], grid_box[1], pixel_grid[row+1, col])
-                e13 = self._create_new_edge(grid_box[1], grid_box[3], pixel_grid[row+1, col])
-                e37 = self._create_new_edge(grid_box[3], grid_box[7], pixel_grid[row+1, col])
-                e73 = self._create_new_edge(grid_box[7], grid_box[3], pixel_grid[row+1, col+1])
-                e36 = self._create_new_edge(grid_box[3], grid_box[6], pixel_grid[row+1, col+1])
-
-                e51.set_opposite_edge(e15)
-                e18.set_opposite_edge(e81)
-                e63.set_opposite_edge(e36)
-                e31.set_opposite_edge(e13)
-                e37.set_opposite_edge(e73)
+        # Each grid box has at most 10 edges. graph_edges_list is sized for this upper bound so that edges are stored by index
+        # instead of repeatedly resizing the list, and trimmed once all edges are created.
+        self.graph_edges_list.extend([None] * (10 * self.graph_nodes_grid_box.shape[0] * self.graph_nodes_grid_box.shape[1]))
+
+        grid_box_cases = self._get_grid_box_cases()
+        if wire_edges_nb is not None:
+            edge_arrays = wire_edges_nb(grid_box_cases, self.graph_nodes_grid_box)
+            self._create_new_edges_from_arrays(*edge_arrays)
+        else:
+            # For each grid box, initialise the internal edges. Grid boxes are visited in raster order through flat lists
+            graph_nodes = self.graph_nodes_list
+            graph_nodes_grid_box = self.graph_nodes_grid_box
+            get_pixel = self.pixel_art_raster.get_pixel
+            num_rows, num_cols = grid_box_cases.shape
+            grid_box_rows = np.repeat(np.arange(num_rows), num_cols).tolist()
+            grid_box_cols = np.tile(np.arange(num_cols), num_rows).tolist()
+            for row, col, case in zip(grid_box_rows, grid_box_cols, grid_box_cases.ravel().tolist()):
+                grid_box = [graph_nodes[node_id] for node_id in graph_nodes_grid_box[row, col].tolist()]
+
+                # If dexter diagonal is present
+                if case == 0:
+                    self._create_new_edge(grid_box[5], grid_box[2], get_pixel(row, col))
+                    self._create_new_edge(grid_box[2], grid_box[4], get_pixel(row, col))
+                    self._create_new_edge(grid_box[4], grid_box[8], get_pixel(row, col))
+                    self._create_new_edge(grid_box[6], grid_box[2], get_pixel(row, col+1))
+                    self._create_new_edge(grid_box[2], grid_box[5], get_pixel(row, col+1))
+                    self._create_new_edge(grid_box[8], grid_box[4], get_pixel(row+1, col))
+                    self._create_new_edge(grid_box[4], grid_box[7], get_pixel(row+1, col))
+                    self._create_new_edge(grid_box[7], grid_box[4], get_pixel(row+1, col+1))
+                    self._create_new_edge(grid_box[4], grid_box[2], get_pixel(row+1, col+1))
+                    self._create_new_edge(grid_box[2], grid_box[6], get_pixel(row+1, col+1))
+
+                # If sinister diagonal is present
+                elif case == 1:
+                    self._create_new_edge(grid_box[5], grid_box[1], get_pixel(row, col))
+                    self._create_new_edge(grid_box[1], grid_box[8], get_pixel(row, col))
+                    self._create_new_edge(grid_box[6], grid_box[3], get_pixel(row, col+1))
+                    self._create_new_edge(grid_box[3], grid_box[1], get_pixel(row, col+1))
+                    self._create_new_edge(grid_box[1], grid_box[5], get_pixel(row, col+1))
+                    self._create_new_edge(grid_box[8], grid_box[1], get_pixel(row+1, col))
+                    self._create_new_edge(grid_box[1], grid_box[3], get_pixel(row+1, col))
+                    self._create_new_edge(grid_box[3], grid_box[7], get_pixel(row+1, col))
+                    self._create_new_edge(grid_box[7], grid_box[3], get_pixel(row+1, col+1))
+                    self._create_new_edge(grid_box[3], grid_box[6], get_pixel(row+1, col+1))
             
-            # If neither diagonal is present
-            else:
-                grid_box = self.graph_nodes_grid_box[row, col]
-                pixel_grid = self.pixel_art_raster.pixel_grid
-                e50 = self._create_new_edge(grid_box[5], grid_box[0], pixel_grid[row, col])
-                e08 = self._create_new_edge(grid_box[0], grid_box[8], pixel_grid[row, col])
-                e60 = self._create_new_edge(grid_box[6], grid_box[0], pixel_grid[row, col+1])
-                e05 = self._create_new_edge(grid_box[0], grid_box[5], pixel_grid[row, col+1])
-                e80 = self._create_new_edge(grid_box[8], grid_box[0], pixel_grid[row+1, col])
-                e07 = self._create_new_edge(grid_box[0], grid_box[7], pixel_grid[row+1, col])
-                e70 = self._create_new_edge(grid_box[7], grid_box[0], pixel_grid[row+1, col+1])
-                e06 = self._create_new_edge(grid_box[0], grid_box[6], pixel_grid[row+1, col+1])
-
-                e50.set_opposite_edge(e05)
-                e80.set_opposite_edge(e08)
-                e60.set_opposite_edge(e06)
-                e70.set_opposite_edge(e07)
+                # If neither diagonal is present
+                else:
+                    self._create_new_edge(grid_box[5], grid_box[0], get_pixel(row, col))
+                    self._create_new_edge(grid_box[0], grid_box[8], get_pixel(row, col))
+                    self._create_new_edge(grid_box[6], grid_box[0], get_pixel(row, col+1))
+                    self._create_new_edge(grid_box[0], grid_box[5], get_pixel(row, col+1))
+                    self._create_new_edge(grid_box[8], grid_box[0], get_pixel(row+1, col))
+                    self._create_new_edge(grid_box[0], grid_box[7], get_pixel(row+1, col))
+                    self._create_new_edge(grid_box[7], grid_box[0], get_pixel(row+1, col+1))
+                    self._create_new_edge(grid_box[0], grid_box[6], get_pixel(row+1, col+1))
+
+        del self.graph_edges_list[self.number_of_edges:]
 
         # For each intialised edge, set its next_edge. Note that every edge will have a next_edge
-        for edge in self.graph_edges_list:
-            next_node = edge.end_node
-            for next_edge in next_node.edge_list:
-                if edge.pixel.id == next_edge.pixel.id:
-                # if edge.pixel.colour == next_edge.pixel.colour:
-                    edge.next_edge = next_edge
-                    break
+        self._set_next_edges(self.pixel_art_raster.pixel_ids.tolist())
 
-    # TODO (P2): Consider taking the object as a parameter and passing it through the function.
-    # The function can add ID and add the object to the list
-    def _create_new_node(
-            self,
-            position: Vector2D = Vector2D(0,0),
-            offset: Vector2D = Vector2D(0,0)
-        ) -> _PixelVectorGraphNode:
+    def _get_grid_box_cases(self) -> NDArray[np.int8]:
         """
-        Create a new _PixelVectorGraphNode object. This method also gives it a unique id, and appends it to graph_nodes_list for traversal later.
+        Get the edge structure of each grid box, which depends on the diagonal edges between its four pixels.
 
-        Args:
-            position (Vector2D): Position of the node to be created. Defaults to origin (0,0)
-            offset (Vector2D): Offset of the created node. Defaults to no offset (0,0)
+        Returns:
+            NDArray[int8]: Array of shape (height-1, width-1), which is 0 where the dexter diagonal is present,
+            1 where only the sinister diagonal is present and 2 where neither diagonal is present.
         """
-        id: int = self.number_of_nodes
-        self.number_of_nodes += 1
-        new_node = _PixelVectorGraphNode(id, position, offset)
-        self.graph_nodes_list.append(new_node)
-        return new_node
+        adjacency_bitmask = self.adjacency_graph.get_adjacency_bitmask(deep_copy=False)
+        has_dexter_diagonal = (adjacency_bitmask[:-1, :-1] & (1 << 7)) != 0
+        has_sinister_diagonal = (adjacency_bitmask[1:, :-1] & (1 << 2)) != 0
+        return np.where(has_dexter_diagonal, 0, np.where(has_sinister_diagonal, 1, 2)).astype(np.int8)
 
     # TODO (P2): Consider taking the object as a parameter and passing it through the function.
     # The function can add ID and add the object to the list
@@ -540,7 +556,11 @@ class PixelVectorGraph:
             next_edge: _PixelVectorGraphEdge = None,
             opposite_edge: _PixelVectorGraphEdge = None):
         """
-        Create a new _PixelVectorGraphEdge object. This method also gives it a unique id, and appends it to graph_nodes_list for traversal later.
+        Create a new _PixelVectorGraphEdge object. This method also gives it a unique id, and stores it in graph_edges_list for traversal later.
+        graph_edges_list must already have a free slot at index number_of_edges.
+
+        If no opposite edge is given, the edge is paired with the previously created edge from end_node to start_node, if any.
+        Otherwise it is kept in _unpaired_edges until that edge is created.
 
         Args:
             start_node (_PixelVectorGraphNode): The node from which the edge originates.
@@ -552,56 +572,105 @@ class PixelVectorGraph:
         id = self.number_of_edges
         self.number_of_edges += 1
         new_edge = _PixelVectorGraphEdge(id, start_node, end_node, pixel, next_edge, opposite_edge)
-        self.graph_edges_list.append(new_edge)
+        self.graph_edges_list[id] = new_edge
         start_node.edge_list.append(new_edge)
+
+        if opposite_edge is None:
+            opposite_edge = self._unpaired_edges.pop((end_node.id, start_node.id), None)
+            if opposite_edge is None:
+                self._unpaired_edges[(start_node.id, end_node.id)] = new_edge
+            else:
+                new_edge.set_opposite_edge(opposite_edge)
         return new_edge
 
-    def _get_node_position(self, adjacency_graph_node_position: Vector2D, node_index: int) -> Vector2D:
+    def _create_new_edges_from_arrays(
+            self,
+            start_node_ids: NDArray[np.int32],
+            end_node_ids: NDArray[np.int32],
+            pixel_rows: NDArray[np.int32],
+            pixel_cols: NDArray[np.int32],
+            opposite_edge_ids: NDArray[np.int32]):
         """
-        Given the position of an adjacency graph node and a corresponding index of a pixel graph node relative to it,
-        returns the position of the pixel graph node.
+        Create a _PixelVectorGraphEdge object for each entry of the given arrays, in a single pass.
+        As with _create_new_edge, each edge gets a unique id and is stored in graph_edges_list, which must already have enough free slots
+        from index number_of_edges. It is also appended to its start node's edge_list.
 
         Args:
-            adjacency_graph_node_position (Vector2D): Position of the adjacency graph node.
-            node_index (int): Index of the vector graph node relative to the adjacency graph node.
-
-        Returns:
-            Vector2D: Position of the pixel graph node.
-        """
-        offsets = [
-            Vector2D(0.5, 0.5),
-            Vector2D(0.25, 0.25),
-            Vector2D(0.75, 0.25),
-            Vector2D(0.75, 0.75),
-            Vector2D(0.25, 0.75),
-            Vector2D(0.5, 0),
-            Vector2D(1, 0.5),
-            Vector2D(0.5, 1),
-            Vector2D(0, 0.5)
+            start_node_ids (NDArray[int32]): ID of the node from which each edge originates.
+            end_node_ids (NDArray[int32]): ID of the node at which each edge terminates.
+            pixel_rows (NDArray[int32]): Row index of the pixel that each edge is covering.
+            pixel_cols (NDArray[int32]): Column index of the pixel that each edge is covering.
+            opposite_edge_ids (NDArray[int32]): Index of the opposite edge of each edge within the given arrays.
+        """
+        nodes = self.graph_nodes_list
+
+        # Pixel views are read-only, so the edges covering the same pixel share a single view.
+        height, width = self.pixel_art_raster.pixel_ids.shape
+        get_pixel = self.pixel_art_raster.get_pixel
+        pixels = [get_pixel(row, col) for row in range(height) for col in range(width)]
+        pixel_indices = pixel_rows.astype(np.int64) * width + pixel_cols
+
+        new_edges = [
+            _PixelVectorGraphEdge(self.number_of_edges + index, nodes[start_node_id], nodes[end_node_id], pixels[pixel_index])
+            for index, (start_node_id, end_node_id, pixel_index)
+            in enumerate(zip(start_node_ids.tolist(), end_node_ids.tolist(), pixel_indices.tolist()))
         ]
+        for new_edge, opposite_edge_id in zip(new_edges, opposite_edge_ids.tolist()):
+            new_edge.opposite_edge = new_edges[opposite_edge_id]
+            new_edge.start_node.edge_list.append(new_edge)
+
+        self.graph_edges_list[self.number_of_edges:self.number_of_edges + len(new_edges)] = new_edges
+        self.number_of_edges += len(new_edges)
 
-        node_position: Vector2D = adjacency_graph_node_position + offsets[node_index]
-        return node_position
-    
     # Any edges where the opposite edge has the same colour are deleted
     # as the edge carries no information.
     def _delete_edges_without_colour_boundary(self):
         """
         Any edge where the opposite edge is covering the same colour is deleted.
         This edge is not adding any detail to the final image. Thus, during simplification of the graph, it should be removed.
-        """
-        for edge in self.graph_edges_list:
-            if edge.pixel.colour == edge.opposite_edge.pixel.colour:
-                edge.id = -1
-                edge.opposite_edge.id = -1
+
+        Edges that already have a negative ID are deleted as well. The remaining edges must have their position in graph_edges_list as ID,
+        which holds for the edges that were not deleted since the graph was constructed or the edges were last compacted.
+        """
+        # Pixels have the same colour if and only if they have the same colour id, so colours are compared as integers
+        pixel_colour_ids = self.adjacency_graph.pixel_colour_ids
+        edges = self.graph_edges_list
+        is_valid = np.fromiter((edge.id >= 0 for edge in edges), dtype=bool, count=len(edges))
+        pixel_rows = np.fromiter((edge.pixel.row for edge in edges), dtype=np.intp, count=len(edges))
+        pixel_cols = np.fromiter((edge.pixel.col for edge in edges), dtype=np.intp, count=len(edges))
+        opposite_edge_ids = np.fromiter((edge.opposite_edge.id for edge in edges), dtype=np.intp, count=len(edges))
+
+        # The opposite edge of a valid edge is always valid. The comparison is meaningless for invalid edges, so they are masked out.
+        edge_colour_ids = pixel_colour_ids[pixel_rows, pixel_cols]
+        is_deleted = is_valid & (edge_colour_ids == edge_colour_ids[opposite_edge_ids])
+        is_deleted[opposite_edge_ids[is_deleted]] = True
+        for edge_id in np.flatnonzero(is_deleted).tolist():
+            edges[edge_id].id = -1
         self._delete_unallocated_edges()
 
-        for edge in self.graph_edges_list:
-            next_node = edge.end_node
-            for next_edge in next_node.edge_list:
-                if edge.pixel.colour == next_edge.pixel.colour:
-                    edge.next_edge = next_edge
-                    break
+        self._set_next_edges(pixel_colour_ids.tolist())
+
+    def _set_next_edges(self, pixel_keys: list[list[int]]):
+        """
+        For each edge, set its next_edge to the first edge in its end node's edge_list that covers a pixel with the same key.
+        Edges for which no such edge exists keep their current next_edge.
+
+        The edges are looked up in a dict keyed by start node ID and pixel key, built in a single pass over graph_edges_list.
+        Each node's edge_list follows the order of graph_edges_list, so the first edge stored for a key is the first one in the edge_list.
+
+        Args:
+            pixel_keys (list[list[int]]): Nested list of shape (height, width) containing the key of each pixel.
+        """
+        edge_keys = [pixel_keys[edge.pixel.row][edge.pixel.col] for edge in self.graph_edges_list]
+
+        outgoing_edges: dict[tuple[int, int], _PixelVectorGraphEdge] = {}
+        for edge, edge_key in zip(self.graph_edges_list, edge_keys):
+            outgoing_edges.setdefault((edge.start_node.id, edge_key), edge)
+
+        for edge, edge_key in zip(self.graph_edges_list, edge_keys):
+            next_edge = outgoing_edges.get((edge.end_node.id, edge_key))
+            if next_edge is not None:
+                edge.next_edge = next_edge
 
     def _delete_unallocated_edges(self):
         """
@@ -610,69 +679,72 @@ class PixelVectorGraph:
 
         The edge IDs are also reassigned so that each edge has an ID from 0 to len(graph_edges_list)-1
         """
+        # An edge is only ever held in the edge_list of its start node, so only those nodes can hold invalid edges.
+        nodes_with_invalid_edges: set[_PixelVectorGraphNode] = set()
         cleaned_edges_list = []
         for edge in self.graph_edges_list:
-            if edge is not None and edge.id >= 0:
-                cleaned_edges_list.append(edge)
+            if edge is None:
+                continue
+            if edge.id < 0:
+                nodes_with_invalid_edges.add(edge.start_node)
+                continue
+            cleaned_edges_list.append(edge)
         self.graph_edges_list = cleaned_edges_list
 
         # Reassign IDs to the remaining edges
         self.number_of_edges = len(self.graph_edges_list)
-        for i in range(self.number_of_edges):
-            self.graph_edges_list[i].id = i
+        for new_id, edge in enumerate(self.graph_edges_list):
+            edge.id = new_id
 
-        # For each node, delete invalid edges
-        for node in self.graph_nodes_list:
-            cleaned_edges_list = []
-            for edge in node.edge_list:
-                if edge is not None and edge.id >= 0:
-                    cleaned_edges_list.append(edge)
-            node.edge_list = cleaned_edges_list
-
-    def _delete_unallocated_nodes(self):
-        """
-        Any nodes in the graph that are None or have negative ID are removed from graph_nodes_list.
+        # For each node with invalid edges, delete them. Invalid edges keep their negative ID, so they are still recognised here.
+        for node in nodes_with_invalid_edges:
+            node.edge_list = [edge for edge in node.edge_list if edge is not None and edge.id >= 0]
 
-        The node IDs are also reassigned so that each node has an ID from 0 to len(graph_nodes_list)-1
+    def _add_t_junction_filler_svg_elements(self, dead_end_edges: list[_PixelVectorGraphEdge], edge_points: NDArray[np.float64]):
         """
-        cleaned_nodes_list = []
-        for node in self.graph_nodes_list:
-            if node is not None and node.id >= 0:
-                cleaned_nodes_list.append(node)
-        self.graph_nodes_list = cleaned_nodes_list
+        Add 2 triangles for each given dead-end edge, that fill the gap between the curves meeting at the T-junction where it ends.
+        The triangles of all T-junctions are computed with array operations and added to svg_renderer as a single batch.
 
-        # Reassign IDs to the remaining nodes
-        self.number_of_nodes = len(self.graph_nodes_list)
-        for i in range(self.number_of_nodes):
-            self.graph_nodes_list[i].id = i
-
-    def _add_t_junction_filler_svg_elements(self, dead_end_edge: _PixelVectorGraphEdge):
-        t_junction_edge_1: _PixelVectorGraphEdge = dead_end_edge.next_edge
-        t_junction_edge_2: _PixelVectorGraphEdge = dead_end_edge.next_edge.opposite_edge.next_edge
-
-        intersection_point: Vector2D = self._get_line_intersection_point(
-            p1 = dead_end_edge.get_centre(),
-            p2 = dead_end_edge.end_node.get_coordinates(),
-            q1 = t_junction_edge_1.get_centre(),
-            q2 = t_junction_edge_2.get_centre()
+        Args:
+            dead_end_edges (list[_PixelVectorGraphEdge]): Dead-end edges ending at the T-junctions to be filled, in order.
+            edge_points (NDArray[float64]): Array of shape (E, 3, 2), where `[edge_id, 0]` is the centre of each edge
+                and `[edge_id, 1]` is the coordinates of its end node.
+        """
+        dead_end_edge_ids = [edge.id for edge in dead_end_edges]
+        t_junction_edge_1_ids = [edge.next_edge.id for edge in dead_end_edges]
+        t_junction_edge_2_ids = [edge.next_edge.opposite_edge.next_edge.id for edge in dead_end_edges]
+
+        dead_end_edge_centres = edge_points[dead_end_edge_ids, 0]
+        t_junction_coordinates = edge_points[dead_end_edge_ids, 1]
+        t_junction_edge_1_centres = edge_points[t_junction_edge_1_ids, 0]
+        t_junction_edge_2_centres = edge_points[t_junction_edge_2_ids, 0]
+
+        intersection_points = self._get_line_intersection_points(
+            p1 = dead_end_edge_centres,
+            p2 = t_junction_coordinates,
+            q1 = t_junction_edge_1_centres,
+            q2 = t_junction_edge_2_centres
         )
 
-        triangle_common_point = intersection_point
-        if float(intersection_point - dead_end_edge.get_centre()) < float(dead_end_edge.end_node.get_coordinates() - dead_end_edge.get_centre()):
-            triangle_common_point = dead_end_edge.end_node.get_coordinates()
-
-        self.svg_renderer.add_polygon([
-            triangle_common_point,
-            t_junction_edge_1.get_centre(),
-            dead_end_edge.get_centre()
-        ],
-        dead_end_edge.pixel.colour)
-        self.svg_renderer.add_polygon([
-            triangle_common_point,
-            t_junction_edge_2.get_centre(),
-            dead_end_edge.get_centre()
-        ],
-        dead_end_edge.opposite_edge.pixel.colour)
+        # The common point of both triangles is the T-junction node if the intersection point is closer to the dead-end edge centre,
+        # or if the lines are parallel and there is no intersection point. Otherwise it is the intersection point.
+        intersection_displacements = intersection_points - dead_end_edge_centres
+        t_junction_displacements = t_junction_coordinates - dead_end_edge_centres
+        is_intersection_closer = ((intersection_displacements[:, 0] * intersection_displacements[:, 0]
+                                 + intersection_displacements[:, 1] * intersection_displacements[:, 1])
+                                < (t_junction_displacements[:, 0] * t_junction_displacements[:, 0]
+                                   + t_junction_displacements[:, 1] * t_junction_displacements[:, 1]))
+        is_parallel = np.isnan(intersection_points[:, 0])
+        triangle_common_points = np.where((is_intersection_closer | is_parallel)[:, np.newaxis], t_junction_coordinates, intersection_points)
+
+        # Vertices of both triangles of each T-junction, of shape (2K, 3, 2)
+        triangle_vertices = np.stack([
+            np.stack([triangle_common_points, t_junction_edge_1_centres, dead_end_edge_centres], axis=1),
+            np.stack([triangle_common_points, t_junction_edge_2_centres, dead_end_edge_centres], axis=1)
+        ], axis=1).reshape(-1, 3, 2)
+        triangle_colours = [colour for edge in dead_end_edges for colour in (edge.pixel.colour, edge.opposite_edge.pixel.colour)]
+
+        self.svg_renderer.add_polygons(triangle_vertices, triangle_colours, self.svg_renderer.scale_factor)
 
     def _set_piecewise_b_spline_area_elements(self):
         """
@@ -686,50 +758,109 @@ class PixelVectorGraph:
             list_of_areas_for_component[component_id] = []
             # colour_for_component
 
-        visited = np.zeros(self.number_of_edges, dtype=bool)
-        for edge in self.graph_edges_list:
-            if not visited[edge.id]:
-                # Visit the edges. If they are in a loop, add the piecewise b-spline area in dual_graph_elements
-                start_edge = edge
-                bezier_curves = []
-                colour = edge.pixel.colour
-                while edge is not None:
-                    visited[edge.id] = True
-                    # If the edge ends in a vertex of degree 4, no Bexier curves should be added.
-                    # Connections should be done to the vertex with straight lines.
-                    if edge.end_node.get_degree() >= 4:
-                        # TODO (P0): The logic should be applied to degree 4 vertices only and not degree 3
-                        line_segment_bezier_curve_1: tuple[Vector2D, Vector2D, Vector2D] = (
-                            edge.get_centre(),
-                            edge.get_centre(),
-                            edge.end_node.get_coordinates()
-                        )
-                        line_segment_bezier_curve_2: tuple[Vector2D, Vector2D, Vector2D] = (
-                            edge.end_node.get_coordinates(),
-                            edge.end_node.get_coordinates(),
-                            edge.next_edge.get_centre()
-                        )
-                        bezier_curves.append(line_segment_bezier_curve_1)
-                        bezier_curves.append(line_segment_bezier_curve_2)
-                    else:
-                        if edge.end_node.get_degree() == 3:
-                            for outward_edge in edge.end_node.edge_list:
-                                inward_edge: _PixelVectorGraphEdge = outward_edge.opposite_edge
-                                if not inward_edge.is_dead_end_edge:
-                                    continue
-                                self._add_t_junction_filler_svg_elements(inward_edge)
-                        bezier_curves.append(edge.get_b_spline_points())
-                    edge = edge.next_edge
-                    if edge is not None and edge.id == start_edge.id:
-                        component_id = start_edge.pixel.connected_component_id
-                        list_of_areas_for_component[component_id].append(bezier_curves)
-                        colour_for_component[component_id] = colour
-                        break
-        
+        # Nodes do not move while rendering, so the centre and end node coordinates of each edge are computed once.
+        # Simplification leaves many nodes without edges, so the coordinates are stored per edge rather than per node.
+        edges = self.graph_edges_list
+        edge_centres: list[Vector2D] = [edge.get_centre() for edge in edges]
+        edge_end_coordinates: list[Vector2D] = [edge.end_node.get_coordinates() for edge in edges]
+
+        # The curve points of each edge are (edge centre, end node, next edge centre), stored in an array of shape (E, 3, 2).
+        # Edges without a next edge are never part of an area, so their last curve point is left as their own centre.
+        next_edge_ids = self._get_next_edge_ids()
+        edge_points = np.empty((len(edges), 3, 2), dtype=np.float64)
+        edge_points[:, 0] = np.array([(centre.x, centre.y) for centre in edge_centres], dtype=np.float64).reshape(-1, 2)
+        edge_points[:, 1] = np.array([(point.x, point.y) for point in edge_end_coordinates], dtype=np.float64).reshape(-1, 2)
+        edge_points[:, 2] = edge_points[np.where(next_edge_ids >= 0, next_edge_ids, np.arange(len(edges))), 0]
+
+        # Degree of the end node of each edge
+        edge_end_degrees = np.fromiter((len(edge.end_node.edge_list) for edge in edges), dtype=np.int8, count=len(edges))
+
+        # The Bezier curves of all edges are selected from their curve points at once, in an array of shape (E, 2, 3, 2).
+        # Only the edges ending in a vertex of degree 4 or more have a second curve.
+        is_line_segment_edge = edge_end_degrees >= 4
+        edge_bezier_curves = edge_points[np.arange(len(edges))[:, np.newaxis, np.newaxis],
+                                         _EDGE_BEZIER_CURVE_POINT_INDICES[is_line_segment_edge.astype(np.intp)]]
+        has_bezier_curve = np.stack([np.ones(len(edges), dtype=bool), is_line_segment_edge], axis=1)
+
+        # Walk along the next edges. Each walk that returns to its first edge encloses an area.
+        if trace_edge_walks_nb is not None:
+            walk_edge_ids, walk_offsets, is_walk_closed = trace_edge_walks_nb(next_edge_ids)
+        else:
+            walk_edge_ids, walk_offsets, is_walk_closed = self._trace_edge_walks(next_edge_ids)
+
+        # The gaps at T-junctions are filled for every visited edge ending in one, in the order the edges are visited.
+        filler_dead_end_edges = []
+        for edge_id in walk_edge_ids[edge_end_degrees[walk_edge_ids] == 3].tolist():
+            for outward_edge in edges[edge_id].end_node.edge_list:
+                inward_edge: _PixelVectorGraphEdge = outward_edge.opposite_edge
+                if inward_edge.is_dead_end_edge:
+                    filler_dead_end_edges.append(inward_edge)
+        if filler_dead_end_edges:
+            self._add_t_junction_filler_svg_elements(filler_dead_end_edges, edge_points)
+
+        for walk_index in np.flatnonzero(is_walk_closed).tolist():
+            area_edge_ids = walk_edge_ids[walk_offsets[walk_index]:walk_offsets[walk_index+1]]
+            start_edge: _PixelVectorGraphEdge = edges[area_edge_ids[0]]
+
+            # Bezier curves of the area in order, of shape (K, 3, 2)
+            bezier_curves = edge_bezier_curves[area_edge_ids][has_bezier_curve[area_edge_ids]]
+            component_id = start_edge.pixel.connected_component_id
+            list_of_areas_for_component[component_id].append(bezier_curves)
+            colour_for_component[component_id] = start_edge.pixel.colour
+
         for component_id in range(self.adjacency_graph.num_connected_components()):
-            self.svg_renderer.add_piecewise_b_spline_area_with_holes(list_of_areas_for_component[component_id],
-                                                                     colour_for_component[component_id],
-                                                                     self.svg_renderer.scale_factor)
+            self.svg_renderer.add_quadratic_path_area_with_holes(list_of_areas_for_component[component_id],
+                                                                 colour_for_component[component_id],
+                                                                 self.svg_renderer.scale_factor)
+
+    def _get_next_edge_ids(self) -> NDArray[np.intp]:
+        """
+        Get the next edge of each edge as an edge ID, so that walks along the next edges can be traced over integers.
+        Edge IDs must be the positions of the edges in graph_edges_list.
+
+        Returns:
+            NDArray[intp]: Array of length E containing the ID of the next edge of each edge, or -1 if the edge has no next edge.
+        """
+        edges = self.graph_edges_list
+        return np.fromiter((-1 if edge.next_edge is None else edge.next_edge.id for edge in edges), dtype=np.intp, count=len(edges))
+
+    @staticmethod
+    def _trace_edge_walks(next_edge_ids: NDArray[np.intp]) -> tuple[NDArray[np.int32], NDArray[np.int32], NDArray[bool]]:
+        """
+        Follow the next edges from each edge that has not been visited yet, in order of edge ID, until the walk returns to its first edge,
+        reaches an edge without a next edge, or reaches an edge visited by an earlier walk.
+
+        Args:
+            next_edge_ids (NDArray[intp]): ID of the next edge of each edge, or -1 if the edge has no next edge.
+
+        Returns:
+            tuple[NDArray[int32], NDArray[int32], NDArray[bool]]: IDs of the edges in the order they are visited, the offset of the first
+            edge of each walk in it followed by the total number of edges, and whether each walk returned to its first edge.
+        """
+        next_edge_ids_list = next_edge_ids.tolist()
+        visited = [False] * len(next_edge_ids_list)
+        walk_edge_ids = []
+        walk_offsets = []
+        is_walk_closed = []
+
+        for start_edge in range(len(next_edge_ids_list)):
+            if visited[start_edge]:
+                continue
+            walk_offsets.append(len(walk_edge_ids))
+            is_walk_closed.append(False)
+
+            edge = start_edge
+            while edge >= 0 and not visited[edge]:
+                visited[edge] = True
+                walk_edge_ids.append(edge)
+                edge = next_edge_ids_list[edge]
+                if edge == start_edge:
+                    is_walk_closed[-1] = True
+                    break
+
+        walk_offsets.append(len(walk_edge_ids))
+        return (np.array(walk_edge_ids, dtype=np.int32), np.array(walk_offsets, dtype=np.int32),
+                np.array(is_walk_closed, dtype=bool))
 
     def _set_piecewise_b_spline_curve_elements(self):
         """
@@ -743,37 +874,52 @@ class PixelVectorGraph:
         """
         Method to set SVG elements in svg_renderer. Sets polygons for each enclosed area in the dual graph.
         """
-        visited = np.zeros(self.number_of_edges, dtype=bool)
-        for edge in self.graph_edges_list:
-            if not visited[edge.id]:
-                # Visit the edges. If they are in a loop, add the polygon in dual_graph_elements
-                start_edge = edge
-                points = []
-                colour = edge.pixel.colour
-                while edge is not None:
-                    visited[edge.id] = True
-                    point: Vector2D = edge.start_node.get_coordinates()
-                    points.append(point)
-                    edge = edge.next_edge
-                    if edge is not None and edge.id == start_edge.id:
-                        self.svg_renderer.add_polygon(points, colour)
-                        break
+        edges = self.graph_edges_list
+
+        # Coordinates of the start node of each edge, of shape (E, 2). Each polygon is sliced from it by the IDs of its edges.
+        edge_start_points = np.array([tuple(edge.start_node.get_coordinates()) for edge in edges], dtype=np.float64).reshape(-1, 2)
+
+        # Walk along the next edges. Each walk that returns to its first edge is a polygon.
+        next_edge_ids = self._get_next_edge_ids()
+        if trace_edge_walks_nb is not None:
+            walk_edge_ids, walk_offsets, is_walk_closed = trace_edge_walks_nb(next_edge_ids)
+        else:
+            walk_edge_ids, walk_offsets, is_walk_closed = self._trace_edge_walks(next_edge_ids)
+
+        polygons: list[NDArray] = []
+        polygon_colours: list[Colour] = []
+        for walk_index in np.flatnonzero(is_walk_closed).tolist():
+            polygon_edge_ids = walk_edge_ids[walk_offsets[walk_index]:walk_offsets[walk_index+1]]
+            polygons.append(edge_start_points[polygon_edge_ids])
+            polygon_colours.append(edges[polygon_edge_ids[0]].pixel.colour)
+
+        if polygons:
+            self.svg_renderer.add_polygons(polygons, polygon_colours, self.svg_renderer.scale_factor)
     
     def _set_dual_graph_edge_svg_elements_for_debugging(self):
         """
         Method to set SVG elements in svg_renderer. Sets lines for each edge in the dual graph.
         """
-        for edge in self.graph_edges_list:
-            self.svg_renderer.add_line(edge.start_node.get_coordinates(), edge.end_node.get_coordinates(), Colour([0, 255, 0, 255]))
+        self._add_edge_lines(self.graph_edges_list, Colour([0, 255, 0, 255]))
 
     def _set_dual_graph_edge_t_junction_svg_elements(self):
         """
         Method to set SVG elements in svg_renderer. Sets lines for each dead-end edge in the dual graph.
         """
-        for edge in self.graph_edges_list:
-            if not edge.is_dead_end_edge:
-                continue
-            self.svg_renderer.add_line(edge.start_node.get_coordinates(), edge.end_node.get_coordinates(), Colour([0, 0, 255, 255]))
+        dead_end_edges = [edge for edge in self.graph_edges_list if edge.is_dead_end_edge]
+        self._add_edge_lines(dead_end_edges, Colour([0, 0, 255, 255]))
+
+    def _add_edge_lines(self, edges: list[_PixelVectorGraphEdge], colour: Colour):
+        """
+        Add a line from the start node to the end node of each of the given edges to svg_renderer, as a single batch.
+
+        Args:
+            edges (list[_PixelVectorGraphEdge]): Edges to draw, in order.
+            colour (Colour): Colour of all lines in RGBA format.
+        """
+        start_points = np.array([tuple(edge.start_node.get_coordinates()) for edge in edges], dtype=np.float64).reshape(-1, 2)
+        end_points = np.array([tuple(edge.end_node.get_coordinates()) for edge in edges], dtype=np.float64).reshape(-1, 2)
+        self.svg_renderer.add_lines(start_points, end_points, [colour] * len(edges))
     
     def _get_line_intersection_point(self,
                                     p1: Vector2D,
@@ -791,19 +937,47 @@ class PixelVectorGraph:
             q2: Point 2 of line 2.
     
         Returns:
-            Vector2D: The intersection point, if it exists.
+            Vector2D: The intersection point, or None if the lines are parallel or coincident within _PARALLEL_LINES_TOLERANCE.
         """
-        x1, y1 = p1
-        x2, y2 = p2
-        x3, y3 = q1
-        x4, y4 = q2
+        points = [np.array([tuple(point)], dtype=np.float64) for point in (p1, p2, q1, q2)]
+        px, py = self._get_line_intersection_points(*points)[0].tolist()
 
-        denom = (x1 - x2)*(y3 - y4) - (y1 - y2)*(x3 - x4)
-
-        if denom == 0:
+        if math.isnan(px):
             return None  # parallel or coincident
 
-        px = ((x1*y2 - y1*x2)*(x3 - x4) - (x1 - x2)*(x3*y4 - y3*x4)) / denom
-        py = ((x1*y2 - y1*x2)*(y3 - y4) - (y1 - y2)*(x3*y4 - y3*x4)) / denom
-
         return Vector2D(px, py)
+
+    def _get_line_intersection_points(self,
+                                      p1: NDArray[np.float64],
+                                      p2: NDArray[np.float64],
+                                      q1: NDArray[np.float64],
+                                      q2: NDArray[np.float64]
+                                  ) -> NDArray[np.float64]:
+        """
+        Batched version of _get_line_intersection_point(). For each i, find the intersection point of the line defined by
+        points p1[i], p2[i], and the line defined by points q1[i], q2[i].
+
+        Args:
+            p1: Array of shape (N, 2) containing point 1 of each line 1.
+            p2: Array of shape (N, 2) containing point 2 of each line 1.
+            q1: Array of shape (N, 2) containing point 1 of each line 2.
+            q2: Array of shape (N, 2) containing point 2 of each line 2.
+
+        Returns:
+            NDArray[float64]: Array of shape (N, 2) containing the intersection points. Rows where the lines are parallel or coincident,
+            within _PARALLEL_LINES_TOLERANCE, are NaN.
+        """
+        x1, y1 = p1[:, 0], p1[:, 1]
+        x2, y2 = p2[:, 0], p2[:, 1]
+        x3, y3 = q1[:, 0], q1[:, 1]
+        x4, y4 = q2[:, 0], q2[:, 1]
+
+        denom = (x1 - x2)*(y3 - y4) - (y1 - y2)*(x3 - x4)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            px = ((x1*y2 - y1*x2)*(x3 - x4) - (x1 - x2)*(x3*y4 - y3*x4)) / denom
+            py = ((x1*y2 - y1*x2)*(y3 - y4) - (y1 - y2)*(x3*y4 - y3*x4)) / denom
+
+        intersection_points = np.stack([px, py], axis=1)
+        intersection_points[np.abs(denom) < _PARALLEL_LINES_TOLERANCE] = np.nan  # parallel or coincident
+        return intersection_points
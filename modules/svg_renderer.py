@@ -1,10 +1,18 @@
 import numpy as np
+from numpy.typing import NDArray
 from colour import Colour
 from vector_2d import Vector2D
 
 DEFAULT_SCALE_FACTOR: int = 20
 DEFAULT_LINE_WIDTH: int = 2
 
+def _normalise_coordinate(value: int | float) -> int | float:
+    """
+    Convert an unscaled coordinate read from an array to an int if it is integral. All batch elements normalise their coordinates
+    before scaling them, so that integral positions are written without a trailing '.0', as if given as ints to the single elements.
+    """
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
 # TODO (P3): Write tests for this module
 # TODO (P3): Implement 'verbose' for all methods
 
@@ -91,6 +99,54 @@ class SVGRenderer:
         new_element = _CircleElement(centre, radius, colour)
         self.svg_elements.append(new_element)
 
+    def add_squares(self, positions: NDArray, colours: NDArray, square_side: int = 1, bound_point: Vector2D = None):
+        """
+        Add a batch of squares to the SVG. Renders the same as calling `add_square()` for each square, in order,
+        but the squares are stored as a single element instead of one object per square.
+
+        Args:
+            positions (NDArray): Array of shape (N, 2) containing the (x,y) position of the top-left corner of each square.
+            colours (NDArray): Array of shape (N, 4) containing the RGBA colour of each square.
+            square_side (int): Length of the side of all squares. Defaults to unit length 1
+            bound_point (Vector2D): Point that must be contained in the SVG file, before scaling. Defaults to the bottom-right corner of the squares
+        """
+        new_element = _SquaresElement(positions, colours, square_side, bound_point)
+        self.svg_elements.append(new_element)
+
+    def add_lines(self, points1: NDArray, points2: NDArray, colours: list, width = DEFAULT_LINE_WIDTH):
+        """
+        Add a batch of lines to the SVG. Equivalent to calling `add_line()` for each line, in order.
+
+        Args:
+            points1 (NDArray): Array of shape (N, 2) containing the (x,y) position of one end point of each line segment.
+            points2 (NDArray): Array of shape (N, 2) containing the (x,y) position of the other end point of each line segment.
+            colours (list): List of N colours in RGBA format, one for each line.
+            width (int): Width of all lines. Does NOT scale with scale_factor. Defaults to DEFAULT_LINE_WIDTH
+        """
+        self.svg_elements.extend(
+            _LineElement(
+                Vector2D(_normalise_coordinate(x1), _normalise_coordinate(y1)),
+                Vector2D(_normalise_coordinate(x2), _normalise_coordinate(y2)),
+                colour,
+                width
+            )
+            for (x1, y1), (x2, y2), colour in zip(points1.tolist(), points2.tolist(), colours)
+        )
+
+    def add_circles(self, centres: NDArray, radius, colours: list):
+        """
+        Add a batch of circles to the SVG. Equivalent to calling `add_circle()` for each circle, in order.
+
+        Args:
+            centres (NDArray): Array of shape (N, 2) containing the (x,y) position of the centre of each circle.
+            radius (int): Length of the radius of all circles.
+            colours (list): List of N colours in RGBA format, one for each circle.
+        """
+        self.svg_elements.extend(
+            _CircleElement(Vector2D(_normalise_coordinate(x), _normalise_coordinate(y)), radius, colour)
+            for (x, y), colour in zip(centres.tolist(), colours)
+        )
+
     def add_polygon(self, points: list = [], colour: Colour = Colour([0,0,0,0]), scale_factor: int = DEFAULT_SCALE_FACTOR):
         """
         Add a new polygon to the SVG.
@@ -103,6 +159,20 @@ class SVGRenderer:
         new_element = _PolygonElement(points, colour, scale_factor)
         self.svg_elements.append(new_element)
     
+    def add_polygons(self, vertices: NDArray | list[NDArray], colours: list, scale_factor: int = DEFAULT_SCALE_FACTOR):
+        """
+        Add a batch of polygons to the SVG. Renders the same as calling `add_polygon()` for each polygon, in order,
+        but the polygons are stored as a single element instead of one object per polygon.
+
+        Args:
+            vertices (NDArray | list[NDArray]): Array of shape (N, K, 2) containing the (x,y) positions of the K vertices of each polygon,
+                in order. Polygons with different numbers of vertices are given as a list of N arrays of shape (K, 2) instead.
+            colours (list): List of N colours in RGBA format, one for each polygon.
+            scale_factor (int): The entire element is scaled by the scale factor with the origin at the center.
+        """
+        new_element = _PolygonsElement(vertices, colours, scale_factor)
+        self.svg_elements.append(new_element)
+
     def add_quadratic_bezier_curve(
             self,
             p0: Vector2D,
@@ -138,6 +208,23 @@ class SVGRenderer:
         new_element = _PathAreaElement(path_area_elements_list, colour, scale_factor)
         self.svg_elements.append(new_element)
 
+    def add_quadratic_path_area_with_holes(self,
+                                           bezier_curves_area_list: list[NDArray] = [],
+                                           colour = Colour([0,0,0,0]),
+                                           scale_factor: int = DEFAULT_SCALE_FACTOR):
+        """
+        Add an area bounded by closed paths of quadratic Bezier curves, given as arrays. Renders the same as
+        `add_piecewise_b_spline_area_with_holes()`, but the curves are stored as arrays instead of one object per curve.
+
+        Args:
+            bezier_curves_area_list (list[NDArray]): List of arrays of shape (K, 3, 2), one for each closed path. Each array contains
+                the (x,y) positions of the 3 points of each of the K quadratic Bezier curves of the path, in order.
+            colour (Colour): Colour of the area in RGBA format. Fills the interior of the area.
+            scale_factor (int): The entire element is scaled by the scale factor with the origin at the center.
+        """
+        new_element = _QuadraticPathAreaElement(bezier_curves_area_list, colour, scale_factor)
+        self.svg_elements.append(new_element)
+
     '''Getters'''
 
     # TODO (P2): It is a better practice to implement __add__() to fit the use case of this method.
@@ -294,6 +381,61 @@ class _SquareElement(_SVGElement):
             f'fill="rgba{fill}" '+ \
             f'transform="translate{transform}"/>'
 
+class _SquaresElement(_SVGElement):
+    """
+    Internal class to be used by SVGRenderer. Stores data for a batch of square SVG elements as arrays.
+
+    Attributes:
+        positions (NDArray): Array of shape (N, 2) containing the (x,y) position of the top-left corner of each square.
+        colours (NDArray): Array of shape (N, 4) containing the RGBA colour of each square.
+        side_length (int): Length of the side of all squares.
+        scale_factor (int): The entire element is scaled by the scale factor with the origin at the center.
+    """
+    def __init__(
+        self,
+        positions: NDArray,
+        colours: NDArray,
+        side_length: int = 1,
+        bound_point: Vector2D = None,
+        scale_factor: int = DEFAULT_SCALE_FACTOR
+    ):
+        """
+        Initialise a _SquaresElement object.
+
+        Args:
+            positions (NDArray): Array of shape (N, 2) containing the (x,y) position of the top-left corner of each square.
+            colours (NDArray): Array of shape (N, 4) containing the RGBA colour of each square.
+            side_length (int): Length of the side of all squares. Defaults to unit length 1
+            bound_point (Vector2D): Point that must be contained in the SVG file, before scaling. Defaults to the bottom-right corner of the squares
+            scale_factor (int): The entire element is scaled by the scale factor with the origin at the center. Defaults to DEFAULT_SCALE_FACTOR
+        """
+        bound_points = []
+        if bound_point is not None:
+            bound_points = [bound_point]
+        elif len(positions) > 0:
+            max_x, max_y = map(_normalise_coordinate, positions.max(axis=0).tolist())
+            bound_points = [Vector2D(max_x + side_length, max_y + side_length)]
+        super().__init__(bound_points, scale_factor)
+        self.positions: NDArray = positions
+        self.colours: NDArray = colours
+        self.side_length: int = side_length
+
+    def __str__(self) -> str:
+        """
+        Returns the SVG object strings of all squares, one per line, in the same format as _SquareElement.
+
+        Returns:
+            str: Lines in the format <rect width="__" height="__" fill="rgba(__)" transform="translate(__)" />
+        """
+        width = self.side_length * self.scale_factor
+        height = self.side_length * self.scale_factor
+        scale_factor = self.scale_factor
+        return '\n\t'.join(
+            f'<rect width="{width}" height="{height}" fill="rgba({r}, {g}, {b}, {a})" '
+            f'transform="translate({_normalise_coordinate(x) * scale_factor}, {_normalise_coordinate(y) * scale_factor})"/>'
+            for (x, y), (r, g, b, a) in zip(self.positions.tolist(), self.colours.tolist())
+        )
+
 class _CircleElement(_SVGElement):
     """
     Internal class to be used by SVGRenderer. Stores data for circle SVG elements.
@@ -423,6 +565,59 @@ class _PolygonElement(_SVGElement):
             points_string += str(point.x*self.scale_factor) + ',' + str(point.y*self.scale_factor) + ' '
         return f'<polygon points="{points_string}" fill="rgba{self.colour}" />'
 
+class _PolygonsElement(_SVGElement):
+    """
+    Internal class to be used by SVGRenderer. Stores data for a batch of polygon SVG elements as arrays.
+
+    Attributes:
+        vertices (NDArray | list[NDArray]): Array of shape (N, K, 2) or list of N arrays of shape (K, 2), containing the (x,y)
+            positions of the K vertices of each polygon, in order.
+        colours (list): List of N colours in RGBA format, one for each polygon.
+        scale_factor (int): The entire element is scaled by the scale factor with the origin at the center.
+    """
+    def __init__(
+            self,
+            vertices: NDArray | list[NDArray],
+            colours: list,
+            scale_factor: int = DEFAULT_SCALE_FACTOR
+        ):
+        """
+        Initialise a _PolygonsElement object.
+
+        Args:
+            vertices (NDArray | list[NDArray]): Array of shape (N, K, 2) or list of N arrays of shape (K, 2), containing the (x,y)
+                positions of the K vertices of each polygon, in order.
+            colours (list): List of N colours in RGBA format, one for each polygon.
+            scale_factor (int): The entire element is scaled by the scale factor with the origin at the center. Defaults to DEFAULT_SCALE_FACTOR
+        """
+        bound_points = []
+        if len(vertices) > 0:
+            all_vertices = np.concatenate([polygon.reshape(-1, 2) for polygon in vertices]) if isinstance(vertices, list) else vertices
+            max_x, max_y = map(_normalise_coordinate, all_vertices.reshape(-1, 2).max(axis=0).tolist())
+            bound_points = [Vector2D(max_x, max_y)]
+        super().__init__(bound_points, scale_factor)
+        self.vertices: NDArray | list[NDArray] = vertices
+        self.colours: list = colours
+
+    def __str__(self) -> str:
+        """
+        Returns the SVG object strings of all polygons, one per line, in the same format as _PolygonElement.
+
+        Returns:
+            str: Lines in the format <polygon points="__" fill="rgba(__)" />
+        """
+        if isinstance(self.vertices, list):
+            vertices = [polygon.tolist() for polygon in self.vertices]
+        else:
+            vertices = self.vertices.tolist()
+        scale_factor = self.scale_factor
+        return '\n\t'.join(
+            '<polygon points="'
+            + ''.join(f'{_normalise_coordinate(x) * scale_factor},{_normalise_coordinate(y) * scale_factor} ' for x, y in polygon)
+            + f'" fill="rgba{colour}" />'
+            for polygon, colour in zip(vertices, self.colours)
+        )
+
 class _QuadraticBezierCurveElement(_SVGElement):
     """
     Internal class to be used by SVGRenderer and _PiecewiseBSplineElement. Contains the 3 points for one quadratic Bezier curve.
@@ -564,3 +759,68 @@ class _PathAreaElement(_SVGElement):
         path_tag = f'<path d="{path_data}" fill="rgba{self.colour}" fill-rule="evenodd"/>'
 
         return path_tag
+
+class _QuadraticPathAreaElement(_SVGElement):
+    """
+    Internal class to be used by SVGRenderer. Stores an area bounded by closed paths of quadratic Bezier curves as arrays.
+    Renders the same as a _PathAreaElement of _PiecewiseBSplineElement paths.
+
+    Attributes:
+        bezier_curves_area_list (list[NDArray]): List of arrays of shape (K, 3, 2), one for each closed path, containing the
+            (x,y) positions of the 3 points of each quadratic Bezier curve of the path.
+        colour (Colour): Colour of the area in RGBA format. Fills the interior of the area.
+        scale_factor (int): The entire element is scaled by the scale factor with the origin at the center.
+    """
+    def __init__(self,
+                 bezier_curves_area_list: list[NDArray] = [],
+                 colour: Colour = Colour([0,0,0,0]),
+                 scale_factor: int = DEFAULT_SCALE_FACTOR):
+        """
+        Initialise a _QuadraticPathAreaElement object.
+
+        Args:
+            bezier_curves_area_list (list[NDArray]): List of arrays of shape (K, 3, 2), one for each closed path, containing the
+                (x,y) positions of the 3 points of each quadratic Bezier curve of the path.
+            colour (Colour): Colour of the area in RGBA format. Fills the interior of the area.
+            scale_factor (int): The entire element is scaled by the scale factor with the origin at the center. Defaults to DEFAULT_SCALE_FACTOR
+        """
+        bound_points = []
+        if len(bezier_curves_area_list) > 0:
+            all_points = np.concatenate([bezier_curves.reshape(-1, 2) for bezier_curves in bezier_curves_area_list])
+            max_x, max_y = map(_normalise_coordinate, all_points.max(axis=0).tolist())
+            bound_points = [Vector2D(max_x, max_y)]
+        super().__init__(bound_points, scale_factor)
+        self.bezier_curves_area_list: list[NDArray] = bezier_curves_area_list
+        self.colour: Colour = colour
+
+    def get_path_data(self) -> str:
+        """
+        Returns the path data of all closed paths, in the same format as _PathAreaElement.
+
+        Returns:
+            str: One block per closed path, each in the format M __ __ Q __ __, __ __ ... Z
+        """
+        scale_factor = self.scale_factor
+        path_data_list = []
+        for bezier_curves in self.bezier_curves_area_list:
+            scaled_bezier_curves = [
+                [(_normalise_coordinate(x) * scale_factor, _normalise_coordinate(y) * scale_factor) for x, y in bezier_curve]
+                for bezier_curve in bezier_curves.tolist()
+            ]
+            (x0, y0), _, _ = scaled_bezier_curves[0]
+            path_data_list.append(
+                f'M {x0} {y0}\n'
+                + ''.join(f'\tQ {x1} {y1}, {x2} {y2}\n' for _, (x1, y1), (x2, y2) in scaled_bezier_curves)
+                + '\tZ\n'
+            )
+        return '\n'.join(path_data_list)
+
+    def __str__(self) -> str:
+        """
+        Returns an SVG object string with proper formatting.
+
+        Returns:
+            str: A string in the format <path d="__" fill="rgba(__)" fill-rule="evenodd"/>
+        """
+        path_data = self.get_path_data()
+        return f'<path d="{path_data}" fill="rgba{self.colour}" fill-rule="evenodd"/>'
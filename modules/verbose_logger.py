@@ -39,14 +39,15 @@ class VerboseLogger:
         elif verbosity == 1:
             logging_level = logging.INFO
 
-        handler = logging.StreamHandler()
-        handler.setFormatter(_ColorFormatter(
-            f"%(levelname)-8s | %(name)-15s \t| %(funcName)-25s \t| %(message)s"
-        ))
-
         logger = logging.getLogger(self.class_name)
         logger.setLevel(logging_level)
-        logger.addHandler(handler)
+        # Loggers are shared by name, so only the first instance of each class attaches a handler.
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(_ColorFormatter(
+                f"%(levelname)-8s | %(name)-15s \t| %(funcName)-25s \t| %(message)s"
+            ))
+            logger.addHandler(handler)
         self.logger = logger
     
     def debug(self, message: str, *args, **kwargs):